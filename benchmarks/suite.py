@@ -0,0 +1,401 @@
+from dataclasses import replace
+from datetime import datetime, timezone
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+import warnings
+
+import numpy as np
+from tabulate import tabulate
+
+# Набор замеров горячих путей репозитория: термодинамические функции (по точке и по массиву),
+# реакции, модель Дебая, аппроксимация Cp, равновесие, загрузка в базу веществ и в базу статей unit-02.
+# Результаты сохраняются в JSON (базовая линия) и сравниваются с ней: замедление больше порога - регрессия.
+#   python benchmarks/suite.py                          сравнение с benchmarks/baseline.json
+#   python benchmarks/suite.py --save                   замер и запись новой базовой линии
+#   python benchmarks/suite.py -k thermo --threshold 0.3
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Папки модулей, которые используют замеры (как sys.path.append в самих скриптах)
+FOLDERS = ('unit-03/ex-1', 'unit-04/ex-2', 'unit-04/ex-3', 'unit-05/ex-1', 'unit-06/ex-2')
+
+# Допустимое замедление относительно базовой линии (0.2 = на 20 %) и наименьшее время серии вызовов, с
+THRESHOLD = 0.2
+MIN_RUN_TIME = 0.2
+
+# Замеры быстрее MICRO_TIME (по базовой линии, доли миллисекунды) зависят от кэшей и планировщика сильнее остальных:
+# для них допустимое замедление не меньше MICRO_THRESHOLD
+MICRO_TIME = 1e-3
+MICRO_THRESHOLD = 0.5
+
+# Сколько раз перемерять замеры, отмеченные как регрессия: на общей машине отдельный запуск бывает
+# медленнее на десятки процентов, поэтому регрессией считается только устойчивое замедление
+RETRIES = 2
+
+VERSION = 1
+
+# Замеры: название -> функция подготовки (аргумент - временная папка для файлов замера), возвращающая
+# вызов без аргументов. Заполняется декоратором benchmark, там же можно задать свой порог замера
+BENCHMARKS = {}
+THRESHOLDS = {}
+
+
+def benchmark(name: str, threshold: float | None = None):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        if threshold is not None:
+            THRESHOLDS[name] = threshold
+        return setup
+    return register
+
+
+# Скрипт ex-N.py по пути от корня репозитория (имя файла с дефисом не импортируется обычным import)
+def _load_script(path: str, name: str):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Скрипт из папки, которой нет в FOLDERS: в unit-02/ex-2 есть свой models.py (как и в unit-03/ex-1),
+# поэтому папка стоит первой в sys.path только на время импорта, затем прежние модули возвращаются
+def _load_isolated(folder: str, path: str, name: str):
+    folder = os.path.join(ROOT, folder)
+    local = {file[:-3] for file in os.listdir(folder) if file.endswith('.py')}
+    saved = {module: sys.modules.pop(module) for module in local if module in sys.modules}
+    sys.path.insert(0, folder)
+    try:
+        return _load_script(path, name)
+    finally:
+        sys.path.remove(folder)
+        for module in local:
+            sys.modules.pop(module, None)
+        sys.modules.update(saved)
+
+
+def _compound(name: str = 'Methane'):
+    from thermodynamic import Thermodynamic
+    return Thermodynamic(name, os.path.join(ROOT, 'unit-04', 'ex-3', 'test-tab-04.csv'))
+
+
+def _temperatures(compound, size: int = 10000) -> np.ndarray:
+    return np.linspace(compound.T_min, compound.T_max, size)
+
+
+@benchmark('thermo.enthalpy.point')
+def _enthalpy_point(folder: str):
+    compound = _compound()
+    return lambda: compound.enthalpy(500.0)
+
+
+@benchmark('thermo.entropy.point')
+def _entropy_point(folder: str):
+    compound = _compound()
+    return lambda: compound.entropy(500.0)
+
+
+@benchmark('thermo.gibbs_energy.point')
+def _gibbs_point(folder: str):
+    compound = _compound()
+    return lambda: compound.gibbs_energy(500.0)
+
+
+@benchmark('thermo.enthalpy.array')
+def _enthalpy_array(folder: str):
+    compound = _compound()
+    T = _temperatures(compound)
+    return lambda: compound.enthalpy(T)
+
+
+@benchmark('thermo.entropy.array')
+def _entropy_array(folder: str):
+    compound = _compound()
+    T = _temperatures(compound)
+    return lambda: compound.entropy(T)
+
+
+@benchmark('thermo.gibbs_energy.array')
+def _gibbs_array(folder: str):
+    compound = _compound()
+    T = _temperatures(compound)
+    return lambda: compound.gibbs_energy(T)
+
+
+@benchmark('reaction.process_reaction')
+def _process_reaction(folder: str):
+    script = _load_script('unit-05/ex-1/ex-1.py', 'unit05_ex1')
+    T = np.linspace(300, 700, 100)
+    return lambda: script.process_reaction(T, ['2H2 + O2 = 2H2O', '2CO + O2 = 2CO2'])
+
+
+@benchmark('debye.model')
+def _debye_model(folder: str):
+    script = _load_script('unit-04/ex-2/ex-2.py', 'unit04_ex2')
+    T = np.linspace(2, 500, 10000)
+    return lambda: script.model(1, 6.022e23, 1.3806e-23, T, 428)
+
+
+@benchmark('fit.fit_custom_function')
+def _fit_custom_function(folder: str):
+    from ingest import T_FIT_MAX, T_FIT_MIN, read_table
+    script = _load_script('unit-03/ex-1/ex-1.py', 'unit03_ex1')
+    table = read_table(os.path.join(ROOT, 'unit-03', 'ex-1', 'data', 'Methane (CH4).csv'))
+    mask = (table[:, 0] >= T_FIT_MIN) & (table[:, 0] <= T_FIT_MAX)
+    return lambda: script.fit_custom_function(table[mask, 0], table[mask, 1] * 4.1868)
+
+
+@benchmark('equilibrium.get_equilibrium_concentrations')
+def _equilibrium(folder: str):
+    from composition import element_matrix
+    from equilibrium import get_equilibrium_concentrations
+    species = ['Methane', 'Water', 'Carbon Monoxide', 'Hydrogen']
+    _, Aeq = element_matrix(species)
+    feed = np.array([1.0, 3.0, 0.0, 0.0])
+    return lambda: get_equilibrium_concentrations(species, Aeq, feed, 750.0, np.ones(len(species)))
+
+
+# Синтетические записи для загрузки в базу: формулы уникальны, значения как у метана
+def _records(count: int = 1000) -> list:
+    from ingest import CompoundRecord
+    record = CompoundRecord('Methane', 'CH4', -17.89, 44.5, 298.0, 2000.0, 14.2, 75.5, -1.8, -18.0, 0.9996)
+    return [replace(record, name=f'Compound {i}', formula=f'X{i}') for i in range(count)]
+
+
+# Новая база в каждом вызове: создание схемы и вставка. Время создания файла базы зависит
+# от файловой системы, поэтому порог выше общего
+@benchmark('db.bulk_load.fresh', threshold=0.5)
+def _bulk_load_fresh(folder: str):
+    from bulk_load import bulk_load, create_loading_engine
+    records = _records()
+    count = iter(range(sys.maxsize))
+
+    def run():
+        engine = create_loading_engine(f"sqlite:///{os.path.join(folder, f'{next(count)}.db')}")
+        bulk_load(engine, records)
+        engine.dispose()
+    return run
+
+
+# Повторная загрузка тех же веществ в существующую базу (upsert)
+@benchmark('db.bulk_load.upsert')
+def _bulk_load_upsert(folder: str):
+    from bulk_load import bulk_load, create_loading_engine
+    records = _records()
+    engine = create_loading_engine(f"sqlite:///{os.path.join(folder, 'upsert.db')}")
+    bulk_load(engine, records)
+    return lambda: bulk_load(engine, records)
+
+
+# Импорт папки таблиц unit-03 (чтение из кэша, аппроксимация, запись) в существующую базу
+@benchmark('db.ingest')
+def _ingest(folder: str):
+    from bulk_load import create_loading_engine
+    from ingest import ingest
+    engine = create_loading_engine(f"sqlite:///{os.path.join(folder, 'ingest.db')}")
+    data = os.path.join(ROOT, 'unit-03', 'ex-1', 'data')
+    return lambda: ingest(data, engine, processes=1)
+
+
+BIBTEX = ('@article{{{key}, author = {{Ivanov, I. and Petrov, P.}}, title = {{Article {key}}}, journal = {{Journal}}, '
+          'volume = {{12}}, year = {{2023}}, pages = {{100--110}}, doi = {{{doi}}}}}')
+
+
+# Заполнение базы статей unit-02 (PopulateCategories, PopulateArticles) в новой базе на каждый вызов.
+# BibTeX берется из заранее заполненного кэша DOI, сеть не используется
+@benchmark('db.articles.populate', threshold=0.5)
+def _articles_populate(folder: str):
+    script = _load_isolated('unit-02/ex-2', 'unit-02/ex-2/ex-2.py', 'unit02_ex2')
+    cachePath = os.path.join(folder, 'doi_cache.db')
+    dois = [doi for dois in script.ARTICLES_BY_CATEGORY.values() for doi in dois]
+    with script.DOIResolver(cachePath) as resolver:
+        resolver.cache.PutMany({doi: BIBTEX.format(key=i, doi=doi) for i, doi in enumerate(dois)})
+    count = iter(range(sys.maxsize))
+
+    def run():
+        engine = script.CreateDatabase(os.path.join(folder, f'articles-{next(count)}.db'))
+        repository = script.ArticleRepository(engine)
+        script.PopulateCategories(repository)
+        script.PopulateArticles(repository, cachePath)
+        engine.dispose()
+    return run
+
+
+# Пакетная запись 1000 статей через ArticleRepository.AddArticles в новую базу с категориями
+@benchmark('db.articles.add_articles', threshold=0.5)
+def _articles_add(folder: str):
+    script = _load_isolated('unit-02/ex-2', 'unit-02/ex-2/ex-2.py', 'unit02_ex2')
+    codes = ['ML', 'EC', 'PC']
+    articles = [{'author': f'Author {i % 50}', 'title': f'Article {i}', 'journal': f'Journal {i % 20}',
+                 'journalNumber': i % 40, 'year': 2000 + i % 25, 'pages': f'{i}--{i + 10}',
+                 'doi': f'10.1000/{i}', 'categoryCode': codes[i % 3]} for i in range(1000)]
+    count = iter(range(sys.maxsize))
+
+    def run():
+        engine = script.CreateDatabase(os.path.join(folder, f'add-{next(count)}.db'))
+        repository = script.ArticleRepository(engine)
+        script.PopulateCategories(repository)
+        repository.AddArticles(articles)
+        engine.dispose()
+    return run
+
+
+# Время одного вызова: число вызовов в серии подбирается так, чтобы серия шла не меньше MIN_RUN_TIME,
+# из repeat серий берутся минимум (для сравнения) и медиана
+def measure(function, repeat: int = 5) -> dict:
+    timer = timeit.Timer(function)
+    number = 1
+    while (elapsed := timer.timeit(number)) < MIN_RUN_TIME and number < 10 ** 6:
+        number *= max(2, min(10, int(MIN_RUN_TIME / max(elapsed, 1e-9))))
+    times = [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {'min': min(times), 'median': statistics.median(times), 'number': number, 'repeat': repeat}
+
+
+def machine() -> dict:
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def run(names: list[str], repeat: int = 5) -> dict:
+    for folder in FOLDERS:
+        sys.path.append(os.path.join(ROOT, folder))
+    results = {}
+    with warnings.catch_warnings(), tempfile.TemporaryDirectory() as folder:
+        warnings.simplefilter('ignore')
+        for name in names:
+            results[name] = measure(BENCHMARKS[name](folder), repeat)
+    return {
+        'version': VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'machine': machine(),
+        'results': results,
+    }
+
+
+def load_baseline(path: str) -> dict | None:
+    try:
+        with open(path, encoding='utf-8') as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        return None
+    if baseline.get('version') != VERSION:
+        raise ValueError(f'Неподдерживаемая версия базовой линии: {path}')
+    return baseline
+
+
+def save_baseline(report: dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+        file.write('\n')
+
+
+# Порог замера: общий threshold, но не меньше своего порога замера и MICRO_THRESHOLD для микрозамеров
+def threshold_for(name: str, baseline_time: float, threshold: float = THRESHOLD) -> float:
+    if name in THRESHOLDS:
+        threshold = max(threshold, THRESHOLDS[name])
+    if baseline_time < MICRO_TIME:
+        threshold = max(threshold, MICRO_THRESHOLD)
+    return threshold
+
+
+# Сравнение по минимальному времени: ratio = текущее / базовое. Выше 1 + порог замера - регрессия,
+# ниже 1 / (1 + порог) - ускорение. Замеры без базового значения помечаются 'new'
+def compare(report: dict, baseline: dict | None, threshold: float = THRESHOLD) -> list[dict]:
+    reference = baseline['results'] if baseline else {}
+    rows = []
+    for name, result in report['results'].items():
+        row = {'name': name, 'min': result['min'], 'median': result['median'], 'baseline': None, 'ratio': None,
+               'threshold': None, 'status': 'new'}
+        if name in reference:
+            row['baseline'] = reference[name]['min']
+            row['ratio'] = result['min'] / reference[name]['min']
+            row['threshold'] = threshold_for(name, row['baseline'], threshold)
+            if row['ratio'] > 1 + row['threshold']:
+                row['status'] = 'REGRESSION'
+            elif row['ratio'] < 1 / (1 + row['threshold']):
+                row['status'] = 'faster'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
+
+
+def _format_time(seconds: float | None) -> str:
+    if seconds is None:
+        return '-'
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.3f} {unit}'
+    return f'{seconds / 1e-9:.1f} ns'
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Замеры горячих путей и сравнение с базовой линией')
+    parser.add_argument('-k', dest='pattern', default='', help='только замеры, в названии которых есть подстрока')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='JSON с базовой линией')
+    parser.add_argument('--save', action='store_true', help='записать результаты как новую базовую линию')
+    parser.add_argument('--output', help='записать результаты в отдельный JSON')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help=f'допустимое замедление (0.2 = 20%%), для микрозамеров не меньше {MICRO_THRESHOLD}')
+    parser.add_argument('--repeat', type=int, default=5, help='число серий каждого замера')
+    parser.add_argument('--retries', type=int, default=RETRIES, help='число перемеров при регрессии')
+    parser.add_argument('--list', action='store_true', help='вывести названия замеров')
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    names = [name for name in BENCHMARKS if args.pattern in name]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+    if not names:
+        raise SystemExit(f'Нет замеров с подстрокой: {args.pattern}')
+
+    baseline = load_baseline(args.baseline)
+    report = run(names, args.repeat)
+    rows = compare(report, baseline, args.threshold)
+    for _ in range(args.retries):
+        flagged = [row['name'] for row in rows if row['status'] == 'REGRESSION']
+        if not flagged:
+            break
+        # Из двух замеров остается более быстрый
+        for name, result in run(flagged, args.repeat)['results'].items():
+            report['results'][name] = min(report['results'][name], result, key=lambda value: value['min'])
+        rows = compare(report, baseline, args.threshold)
+    print(tabulate([[row['name'], _format_time(row['min']), _format_time(row['median']), _format_time(row['baseline']),
+                     '-' if row['ratio'] is None else f"{row['ratio']:.2f}",
+                     '-' if row['threshold'] is None else f"{row['threshold']:.0%}", row['status']] for row in rows],
+                   headers=['Замер', 'Минимум', 'Медиана', 'Базовая линия', 'Отношение', 'Порог', 'Статус'], tablefmt='grid'))
+    if baseline and baseline.get('machine') != report['machine']:
+        print(f"Базовая линия снята на другой машине ({baseline['machine'].get('platform')}), сравнение ориентировочное")
+
+    if args.output:
+        save_baseline(report, args.output)
+    if args.save:
+        # Замеры, не вошедшие в текущий запуск (-k), сохраняются из прежней базовой линии
+        if baseline and args.pattern:
+            report['results'] = baseline['results'] | report['results']
+        save_baseline(report, args.baseline)
+        print(f'Базовая линия записана: {args.baseline}')
+        return 0
+    regressions = [row['name'] for row in rows if row['status'] == 'REGRESSION']
+    if regressions:
+        print(f"Регрессии (медленнее базовой линии больше допустимого): {', '.join(regressions)}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,22 +7,39 @@ dbConnection = sql.Connection("./unit-01/unit-01.db")
 # Получаем курсор
 dbCursor = dbConnection.cursor()
 
-# Создаем таблицу Paper
+# Создаем таблицу Paper с типами колонок, ключом и уникальным DOI
 dbCursor.execute(
-    "CREATE TABLE IF NOT EXISTS Paper(author, journal, volume, year, pages, pub_type, doi)"
+    """
+    CREATE TABLE IF NOT EXISTS Paper(
+        id INTEGER PRIMARY KEY,
+        author TEXT NOT NULL,
+        journal TEXT NOT NULL,
+        volume INTEGER,
+        year INTEGER NOT NULL,
+        pages TEXT,
+        pub_type TEXT,
+        doi TEXT NOT NULL UNIQUE
+    )
+    """
+)
+
+# Индекс по году: условие WHERE year > ... читает диапазон индекса, а не всю таблицу
+dbCursor.execute(
+    "CREATE INDEX IF NOT EXISTS ix_paper_year ON Paper(year, id)"
 )
 
-# Заполняем таблицу
+# Заполняем таблицу (повторный запуск не дублирует записи с тем же DOI)
 dbCursor.execute(
     """
-    INSERT INTO Paper VALUES
-    ('Winifred Watsica', 'Xiphias arca canto aliquam crux', 12, 2015, 23, 'Original Research', 'doi:10.1080/02626667.2015.1623456'),
-    ('Leonid Gromov', 'Carcharodon carcharias ultra paludem imperiosus', 9, 2018, 19, 'Case Study', 'doi:10.1080/02626667.2018.1854921'),
-    ('Mariya Ivanova', 'Delphinus delphis e valle clarus', 11, 2021, 30, 'Technical Note', 'doi:10.1080/02626667.2021.1930487'),
-    ('Igor Sokolov', 'Octopus vulgaris per collum invisibilis', 18, 2022, 25, 'Research Letter', 'doi:10.1080/02626667.2022.2043278'),
-    ('Veronika Petrovna', 'Sphyrna mokarran inter astrum opulentia', 17, 2024, 21, 'Short Communication', 'doi:10.1080/02626667.2024.2124567')
+    INSERT OR IGNORE INTO Paper(author, journal, volume, year, pages, pub_type, doi) VALUES
+    ('Winifred Watsica', 'Xiphias arca canto aliquam crux', 12, 2015, '23', 'Original Research', 'doi:10.1080/02626667.2015.1623456'),
+    ('Leonid Gromov', 'Carcharodon carcharias ultra paludem imperiosus', 9, 2018, '19', 'Case Study', 'doi:10.1080/02626667.2018.1854921'),
+    ('Mariya Ivanova', 'Delphinus delphis e valle clarus', 11, 2021, '30', 'Technical Note', 'doi:10.1080/02626667.2021.1930487'),
+    ('Igor Sokolov', 'Octopus vulgaris per collum invisibilis', 18, 2022, '25', 'Research Letter', 'doi:10.1080/02626667.2022.2043278'),
+    ('Veronika Petrovna', 'Sphyrna mokarran inter astrum opulentia', 17, 2024, '21', 'Short Communication', 'doi:10.1080/02626667.2024.2124567')
     """
 )
+dbConnection.commit()
 
 # Выбираем все записи из таблицы
 result = dbCursor.execute(
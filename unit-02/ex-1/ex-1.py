@@ -1,23 +1,4 @@
-from dataclasses import dataclass
-from tabulate import tabulate
-
-# Определение класса Compound
-@dataclass
-class Compound:
-    Name: str
-    Formula: str
-    MolecularWeight: float
-    Density: float
-    State: str
-
-# Определение класса Paper
-@dataclass
-class Paper:
-    Author: str
-    Journal: str
-    Number: int
-    Year: int
-    Pages: str
+from records import Compound, Paper, RecordTable
 
 # Создаем три экземпляра соединений
 compounds = [
@@ -25,34 +6,49 @@ compounds = [
     Compound(Name="Метан", Formula="CH4", MolecularWeight=16.04, Density=0.7168, State="Газ"),
     Compound(Name="Натрий хлорид", Formula="NaCl", MolecularWeight=58.44, Density=2165, State="Твердое тело")
 ]
+compoundsTable = RecordTable.FromRecords(Compound, compounds)
 
 # Вывод информации о хим. соединениях в формате таблицы
 compoundsTableHeaders = [
     "Название", "Формула", "Молярная масса, г/моль", "Плотность, кг/м3", "Состояние"
 ]
 print("\nИнформация о хим. соединениях в формате таблицы:")
-print(tabulate(compounds, headers=compoundsTableHeaders, tablefmt="grid"))
+compoundsTable.Render(compoundsTableHeaders)
 
 # Выводим формулы всех веществ
 print("\nФормулы всех экземпляров Compound:")
-for compound in compounds:
-    print(compound.Formula)
+for formula in compoundsTable['Formula']:
+    print(formula)
+
+# Отбор по колонке без цикла по объектам
+print("\nГазы:")
+for compound in compoundsTable.Where(State="Газ"):
+    print(compound.Name)
 
 # Создаем три экземпляра публикаций
 papers = [
-    Paper(Author="Иванов И.И.", Journal="Химия сегодня", Number=45, Year=2020, Pages="12-25"),
-    Paper(Author="Петров П.П.", Journal="Физика для чайников", Number=12, Year=2018, Pages="100-112"),
-    Paper(Author="Сидоров С.С.", Journal="Юный химик", Number=3, Year=2019, Pages="50-60")
+    Paper(Author="Иванов И.И.", Journal="Химия сегодня", Number=45, Year=2020, Pages="12-25", Doi="doi:10.1000/chem-today.2020.45.12"),
+    Paper(Author="Петров П.П.", Journal="Физика для чайников", Number=12, Year=2018, Pages="100-112", Doi="doi:10.1000/physics-dummies.2018.12.100"),
+    Paper(Author="Сидоров С.С.", Journal="Юный химик", Number=3, Year=2019, Pages="50-60", Doi="doi:10.1000/young-chemist.2019.3.50")
 ]
+papersTable = RecordTable.FromRecords(Paper, papers)
 
 # Вывод информации о статьях в формате таблицы
 papersTableHeaders = [
-    "Автор", "Журнал", "Номер журнала", "Год журнала", "Страницы журнала"
+    "Автор", "Журнал", "Номер журнала", "Год журнала", "Страницы журнала", "DOI"
 ]
 print("\nИнформация о статьях в виде таблицы:")
-print(tabulate(papers, headers=papersTableHeaders, tablefmt="grid"))
+papersTable.Render(papersTableHeaders)
 
 # Выводим информацию о статьях в формате journal(year) - author
 print("\nИнформация о статьях в формате journal(year) - author:")
-for paper in papers:
-    print(f"{paper.Journal}({paper.Year}) - {paper.Author}")
\ No newline at end of file
+for paper in papersTable:
+    print(f"{paper.Journal}({paper.Year}) - {paper.Author}")
+
+# Статьи, отсортированные по году
+print("\nСтатьи по году:")
+for paper in papersTable.Sort("Year"):
+    print(f"{paper.Year}: {paper.Author}")
+print("\nЧисло статей по годам:")
+for year, group in papersTable.GroupBy("Year").items():
+    print(f"{year}: {len(group)}")
\ No newline at end of file
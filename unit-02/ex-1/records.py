@@ -0,0 +1,222 @@
+from dataclasses import dataclass, fields
+from typing import Iterable, Iterator, TextIO
+import numpy as np
+import sqlite3
+import sys
+
+# Определение класса Compound (без __dict__, неизменяемый)
+@dataclass(frozen=True, slots=True)
+class Compound:
+    Name: str
+    Formula: str
+    MolecularWeight: float
+    Density: float
+    State: str
+
+# Определение класса Paper (без __dict__, неизменяемый)
+@dataclass(frozen=True, slots=True)
+class Paper:
+    Author: str
+    Journal: str
+    Number: int
+    Year: int
+    Pages: str
+    Doi: str
+
+# Типы колонок NumPy по аннотациям полей. Строки хранятся как U<n> фиксированной ширины,
+# ширина определяется по самой длинной строке в данных
+FIELD_DTYPES = {str: np.str_, 'str': np.str_, int: np.int64, 'int': np.int64, float: np.float64, 'float': np.float64}
+
+# Таблицы SQLite для каждого типа записей: имя таблицы, схема, соответствие поле -> колонка и команда вставки.
+# Paper совпадает с таблицей из unit-01: страницы - текст (бывают диапазоны '100-110'), DOI обязателен и уникален,
+# повторная запись статьи с тем же DOI пропускается (INSERT OR IGNORE, как в unit-01), поэтому запись в unit-01.db можно повторять
+SQLITE_TABLES = {
+    Compound: (
+        'Compound',
+        """
+        CREATE TABLE IF NOT EXISTS Compound(
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            formula TEXT NOT NULL,
+            molecular_weight REAL,
+            density REAL,
+            state TEXT
+        )
+        """,
+        {'Name': 'name', 'Formula': 'formula', 'MolecularWeight': 'molecular_weight', 'Density': 'density', 'State': 'state'},
+        'INSERT'
+    ),
+    Paper: (
+        'Paper',
+        """
+        CREATE TABLE IF NOT EXISTS Paper(
+            id INTEGER PRIMARY KEY,
+            author TEXT NOT NULL,
+            journal TEXT NOT NULL,
+            volume INTEGER,
+            year INTEGER NOT NULL,
+            pages TEXT,
+            pub_type TEXT,
+            doi TEXT NOT NULL UNIQUE
+        )
+        """,
+        {'Author': 'author', 'Journal': 'journal', 'Number': 'volume', 'Year': 'year', 'Pages': 'pages', 'Doi': 'doi'},
+        'INSERT OR IGNORE'
+    ),
+}
+
+# Размер порции при чтении из SQLite и выводе таблицы
+CHUNK_SIZE = 10000
+
+
+# Набор записей одного типа в виде структурированного массива NumPy (по колонке на поле).
+# Фильтрация, сортировка и группировка выполняются над колонками целиком, без цикла по объектам
+class RecordTable:
+    def __init__(self, recordType: type, data: np.ndarray):
+        self.recordType = recordType
+        self.data = data
+
+    @staticmethod
+    def _dtype(recordType: type, columns: dict[str, np.ndarray]) -> np.dtype:
+        return np.dtype([(field.name, columns[field.name].dtype) for field in fields(recordType)])
+
+    @staticmethod
+    def _column(field, values) -> np.ndarray:
+        return np.asarray(values, dtype=FIELD_DTYPES[field.type])
+
+    # Таблица из колонок (имя поля -> значения)
+    @classmethod
+    def FromColumns(cls, recordType: type, **columns) -> 'RecordTable':
+        columns = {field.name: cls._column(field, columns[field.name]) for field in fields(recordType)}
+        data = np.empty(len(next(iter(columns.values()))), dtype=cls._dtype(recordType, columns))
+        for name, column in columns.items():
+            data[name] = column
+        return cls(recordType, data)
+
+    # Таблица из объектов dataclass
+    @classmethod
+    def FromRecords(cls, recordType: type, records: Iterable) -> 'RecordTable':
+        records = list(records)
+        return cls.FromColumns(recordType, **{
+            field.name: [getattr(record, field.name) for record in records] for field in fields(recordType)
+        })
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    # table['Year'] - колонка; table[i] - запись dataclass; маска, срез или индексы - новая таблица
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.data[key]
+        if isinstance(key, (int, np.integer)):
+            return self.recordType(*self.data[key].tolist())
+        return RecordTable(self.recordType, self.data[key])
+
+    # Записи создаются по одной при обходе, а не хранятся списком
+    def __iter__(self) -> Iterator:
+        for start in range(0, len(self.data), CHUNK_SIZE):
+            for row in self.data[start:start + CHUNK_SIZE].tolist():
+                yield self.recordType(*row)
+
+    def Columns(self) -> tuple[str, ...]:
+        return self.data.dtype.names
+
+    def Filter(self, mask) -> 'RecordTable':
+        return RecordTable(self.recordType, self.data[np.asarray(mask, dtype=bool)])
+
+    # Отбор по равенству полей: Where(State='Газ'), для списка значений - принадлежность списку
+    def Where(self, **conditions) -> 'RecordTable':
+        mask = np.ones(len(self.data), dtype=bool)
+        for name, value in conditions.items():
+            if isinstance(value, (list, tuple, set, np.ndarray)):
+                mask &= np.isin(self.data[name], list(value))
+            else:
+                mask &= self.data[name] == value
+        return self.Filter(mask)
+
+    # Устойчивая сортировка по нескольким полям (первое поле - главное). При descending=True ключи
+    # заменяются номерами значений со знаком минус (строки отрицать нельзя), поэтому записи
+    # с равными ключами остаются в исходном порядке, как и при сортировке по возрастанию
+    def Sort(self, *names: str, descending: bool = False) -> 'RecordTable':
+        keys = [self.data[name] for name in reversed(names)]
+        if descending:
+            keys = [-np.unique(key, return_inverse=True)[1] for key in keys]
+        order = np.lexsort(keys)
+        return RecordTable(self.recordType, self.data[order])
+
+    # Группы по значению поля: {значение: таблица}. Одна сортировка на все группы
+    def GroupBy(self, name: str) -> dict:
+        order = np.argsort(self.data[name], kind='stable')
+        keys, starts = np.unique(self.data[name][order], return_index=True)
+        parts = np.split(self.data[order], starts[1:])
+        return {key: RecordTable(self.recordType, part) for key, part in zip(keys.tolist(), parts)}
+
+    # Агрегат колонки по группам: {значение: reducer.reduce(колонка группы)}, по умолчанию сумма
+    def Aggregate(self, by: str, column: str, reducer: np.ufunc = np.add) -> dict:
+        order = np.argsort(self.data[by], kind='stable')
+        keys, starts = np.unique(self.data[by][order], return_index=True)
+        return dict(zip(keys.tolist(), reducer.reduceat(self.data[column][order], starts).tolist()))
+
+    # Запись в таблицу SQLite (схема и команда вставки из SQLITE_TABLES). Строки передаются в executemany потоком
+    def ToSQLite(self, connection: sqlite3.Connection):
+        table, schema, mapping, insert = SQLITE_TABLES[self.recordType]
+        connection.execute(schema)
+        names = list(mapping)
+        placeholders = ', '.join('?' * len(names))
+        for start in range(0, len(self.data), CHUNK_SIZE):
+            chunk = self.data[start:start + CHUNK_SIZE]
+            connection.executemany(
+                f"{insert} INTO {table}({', '.join(mapping.values())}) VALUES ({placeholders})",
+                zip(*(chunk[name].tolist() for name in names))
+            )
+        connection.commit()
+
+    # Чтение таблицы SQLite порциями сразу в колонки
+    @classmethod
+    def FromSQLite(cls, recordType: type, connection: sqlite3.Connection, where: str = '', parameters=()) -> 'RecordTable':
+        table, _, mapping, _ = SQLITE_TABLES[recordType]
+        cursor = connection.execute(f"SELECT {', '.join(mapping.values())} FROM {table} {where}", parameters)
+        recordFields = fields(recordType)
+        chunks = {field.name: [] for field in recordFields}
+        while rows := cursor.fetchmany(CHUNK_SIZE):
+            for field, values in zip(recordFields, zip(*rows)):
+                chunks[field.name].append(cls._column(field, values))
+        return cls.FromColumns(recordType, **{
+            field.name: np.concatenate(chunks[field.name]) if chunks[field.name] else cls._column(field, [])
+            for field in recordFields
+        })
+
+    # Вывод в виде таблицы (формат как grid в tabulate). Ширина колонок вычисляется по колонкам целиком,
+    # строки форматируются и печатаются порциями, поэтому список списков не создается
+    def Render(self, headers: list[str] | None = None, file: TextIO = sys.stdout, floatFormat: str = 'g'):
+        headers = list(headers or self.Columns())
+        numeric = [self.data.dtype[name].kind in 'iuf' for name in self.Columns()]
+
+        def text(chunk: np.ndarray, name: str) -> np.ndarray:
+            column = chunk[name]
+            if column.dtype.kind == 'f':
+                return np.char.mod(f'%{floatFormat}', column)
+            return column.astype(np.str_)
+
+        widths = [
+            max(len(header), int(np.char.str_len(text(self.data, name)).max(initial=0)))
+            for header, name in zip(headers, self.Columns())
+        ]
+
+        def line(fill: str) -> str:
+            return '+' + '+'.join(fill * (width + 2) for width in widths) + '+\n'
+
+        file.write(line('-'))
+        file.write('| ' + ' | '.join(header.ljust(width) for header, width in zip(headers, widths)) + ' |\n')
+        file.write(line('='))
+        separator = line('-')
+        for start in range(0, len(self.data), CHUNK_SIZE):
+            chunk = self.data[start:start + CHUNK_SIZE]
+            cells = [
+                np.char.rjust(text(chunk, name), width) if isNumeric else np.char.ljust(text(chunk, name), width)
+                for name, width, isNumeric in zip(self.Columns(), widths, numeric)
+            ]
+            rows = cells[0]
+            for column in cells[1:]:
+                rows = np.char.add(np.char.add(rows, ' | '), column)
+            file.write(''.join(f'| {row} |\n{separator}' for row in rows.tolist()))
@@ -0,0 +1,71 @@
+from typing import Iterable, Iterator
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import joinedload, selectinload, sessionmaker
+
+from models import Article, ArticleCategory
+
+# Размер порции при потоковом чтении и пакетной записи
+BATCH_SIZE = 1000
+
+
+# Доступ к статьям и категориям. Фабрика сессий создается один раз на движок,
+# связи подгружаются заранее (joinedload/selectinload), а не отдельным запросом на каждую строку
+class ArticleRepository:
+    def __init__(self, engine):
+        self.engine = engine
+        self.Session = sessionmaker(bind=engine)
+
+    def CountCategories(self) -> int:
+        with self.Session() as session:
+            return session.scalar(select(func.count()).select_from(ArticleCategory))
+
+    def CountArticles(self) -> int:
+        with self.Session() as session:
+            return session.scalar(select(func.count()).select_from(Article))
+
+    # Соответствие код категории -> id одним запросом
+    def CategoryIds(self) -> dict[str, int]:
+        with self.Session() as session:
+            return dict(session.execute(select(ArticleCategory.code, ArticleCategory.id)).all())
+
+    def AddCategories(self, categories: dict[str, str]):
+        with self.Session.begin() as session:
+            session.execute(insert(ArticleCategory), [{'code': code, 'title': title} for code, title in categories.items()])
+
+    # Пакетная запись статей через Core executemany. Каждая статья - словарь полей Article с ключом categoryCode вместо categoryId
+    def AddArticles(self, articles: Iterable[dict], batchSize: int = BATCH_SIZE) -> int:
+        categoryIds = self.CategoryIds()
+        count = 0
+        batch = []
+        with self.Session.begin() as session:
+            for article in articles:
+                article = dict(article)
+                article['categoryId'] = categoryIds[article.pop('categoryCode')]
+                batch.append(article)
+                if len(batch) == batchSize:
+                    session.execute(insert(Article.__table__), batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                session.execute(insert(Article.__table__), batch)
+                count += len(batch)
+        return count
+
+    # Потоковое чтение статей с категорией (JOIN в том же запросе). Строки читаются порциями по batchSize,
+    # поэтому память не растет с размером таблицы
+    def IterArticles(self, categoryCode: str | None = None, year: int | None = None,
+                     batchSize: int = BATCH_SIZE) -> Iterator[Article]:
+        query = select(Article).options(joinedload(Article.category)).order_by(Article.id)
+        if categoryCode is not None:
+            categoryId = select(ArticleCategory.id).where(ArticleCategory.code == categoryCode).scalar_subquery()
+            query = query.where(Article.categoryId == categoryId)
+        if year is not None:
+            query = query.where(Article.year == year)
+        with self.Session() as session:
+            for article in session.scalars(query.execution_options(yield_per=batchSize)):
+                yield article
+
+    # Категории вместе со статьями: два запроса независимо от числа категорий
+    def CategoriesWithArticles(self) -> list[ArticleCategory]:
+        with self.Session() as session:
+            return list(session.scalars(select(ArticleCategory).options(selectinload(ArticleCategory.articles))))
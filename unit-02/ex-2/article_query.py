@@ -0,0 +1,57 @@
+from typing import NamedTuple
+from sqlalchemy import select, tuple_
+
+from models import Article, ArticleCategory
+
+# Колонки, которые возвращают функции поиска (кортежи строк вместо объектов ORM)
+ARTICLE_COLUMNS = (Article.id, Article.author, Article.title, Article.journal,
+                   Article.journalNumber, Article.year, Article.pages, Article.doi)
+
+PAGE_SIZE = 100
+
+
+# Страница результатов: строки и ключ для запроса следующей страницы (None - страница последняя)
+class Page(NamedTuple):
+    rows: list
+    after: tuple | None
+
+
+# Постраничная выборка по ключу (keyset): вместо OFFSET условие "ключ сортировки > последнего ключа",
+# поэтому каждая страница читается из индекса за O(log n + limit) независимо от номера страницы
+def _page(connection, query, key: tuple, after: tuple | None, limit: int, keyOf) -> Page:
+    if after is not None:
+        query = query.where(tuple_(*key) > tuple_(*after))
+    rows = connection.execute(query.order_by(*key).limit(limit)).all()
+    return Page(rows, keyOf(rows[-1]) if len(rows) == limit else None)
+
+
+def _yearKey(row) -> tuple:
+    return row.year, row.id
+
+
+# Статьи за годы yearFrom..yearTo включительно
+def SearchByYear(connection, yearFrom: int, yearTo: int, after: tuple | None = None, limit: int = PAGE_SIZE) -> Page:
+    query = select(*ARTICLE_COLUMNS).where(Article.year.between(yearFrom, yearTo))
+    return _page(connection, query, (Article.year, Article.id), after, limit, _yearKey)
+
+
+# Статьи категории (по коду), по годам
+def SearchByCategory(connection, categoryCode: str, after: tuple | None = None, limit: int = PAGE_SIZE) -> Page:
+    categoryId = select(ArticleCategory.id).where(ArticleCategory.code == categoryCode).scalar_subquery()
+    query = select(*ARTICLE_COLUMNS).where(Article.categoryId == categoryId)
+    return _page(connection, query, (Article.year, Article.id), after, limit, _yearKey)
+
+
+# Статьи журнала, по годам
+def SearchByJournal(connection, journal: str, after: tuple | None = None, limit: int = PAGE_SIZE) -> Page:
+    query = select(*ARTICLE_COLUMNS).where(Article.journal == journal)
+    return _page(connection, query, (Article.year, Article.id), after, limit, _yearKey)
+
+
+# Статьи авторов, чья запись начинается с prefix (с учетом регистра). Префикс задается
+# диапазоном [prefix, следующая строка), который, в отличие от LIKE, использует индекс
+def SearchByAuthorPrefix(connection, prefix: str, after: tuple | None = None, limit: int = PAGE_SIZE) -> Page:
+    query = select(*ARTICLE_COLUMNS).where(Article.author >= prefix)
+    if prefix:
+        query = query.where(Article.author < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+    return _page(connection, query, (Article.author, Article.id), after, limit, lambda row: (row.author, row.id))
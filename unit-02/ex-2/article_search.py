@@ -0,0 +1,90 @@
+from sqlalchemy import inspect, text
+
+# Полнотекстовый индекс FTS5 по названию, авторам и журналу. Таблица внешнего содержимого:
+# тексты хранятся только в articles, индекс ссылается на них по rowid = articles.id.
+# prefix='2 3' - дополнительные индексы для быстрых запросов по началу слова
+SEARCH_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, author, journal,
+        content='articles', content_rowid='id',
+        prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    # Триггеры поддерживают индекс в соответствии с таблицей articles
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, author, journal) VALUES (new.id, new.title, new.author, new.journal);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, author, journal) VALUES ('delete', old.id, old.title, old.author, old.journal);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, author, journal ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, author, journal) VALUES ('delete', old.id, old.title, old.author, old.journal);
+        INSERT INTO articles_fts(rowid, title, author, journal) VALUES (new.id, new.title, new.author, new.journal);
+    END
+    """,
+)
+
+# Веса колонок для BM25 (title, author, journal): совпадение в названии важнее, чем в журнале
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+SEARCH_LIMIT = 20
+
+SEARCH_QUERY = text(f"""
+    SELECT articles.id, articles.author, articles.title, articles.journal, articles.year, articles.doi,
+           bm25(articles_fts, {', '.join(map(str, BM25_WEIGHTS))}) AS score
+    FROM articles_fts JOIN articles ON articles.id = articles_fts.rowid
+    WHERE articles_fts MATCH :query
+    ORDER BY score
+    LIMIT :limit
+""")
+
+
+# Создание индекса и триггеров. Если индекс создается для уже заполненной таблицы, он строится заново
+def CreateSearchIndex(engine):
+    exists = inspect(engine).has_table('articles_fts')
+    with engine.begin() as connection:
+        for statement in SEARCH_SCHEMA:
+            connection.exec_driver_sql(statement)
+        if not exists:
+            connection.exec_driver_sql("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+
+
+# Экранирование пользовательского текста как строки FTS5 (без операторов AND/OR/NEAR и т.п.)
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+# Поиск по выражению FTS5 как есть, результаты по убыванию релевантности (меньший bm25 - выше)
+def Search(connection, query: str, limit: int = SEARCH_LIMIT) -> list:
+    return connection.execute(SEARCH_QUERY, {'query': query, 'limit': limit}).all()
+
+
+# Статьи, содержащие все слова (в любой из колонок). Пустая строка (или только пробелы) - пустой результат,
+# а не ошибка синтаксиса FTS5
+def SearchKeywords(connection, words: str, limit: int = SEARCH_LIMIT) -> list:
+    words = words.split()
+    if not words:
+        return []
+    return Search(connection, ' AND '.join(_quote(word) for word in words), limit)
+
+
+# Статьи, в названии которых есть фраза (слова подряд)
+def SearchTitlePhrase(connection, phrase: str, limit: int = SEARCH_LIMIT) -> list:
+    phrase = phrase.strip()
+    if not phrase:
+        return []
+    return Search(connection, f'title : {_quote(phrase)}', limit)
+
+
+# Статьи авторов, у которых есть слово (фамилия, имя), начинающееся с prefix
+def SearchAuthorPrefix(connection, prefix: str, limit: int = SEARCH_LIMIT) -> list:
+    prefix = prefix.strip()
+    if not prefix:
+        return []
+    return Search(connection, f'author : {_quote(prefix)}*', limit)
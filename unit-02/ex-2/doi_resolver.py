@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import bibtexparser
+import requests
+import sqlite3
+import threading
+import time
+
+# Коды ответа, при которых запрос повторяется
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+# Локальный кэш BibTeX-записей в SQLite (ключ - DOI)
+class DOICache:
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS doi_cache (doi TEXT PRIMARY KEY, bibtex TEXT NOT NULL, fetched_at REAL NOT NULL)'
+        )
+        self.connection.commit()
+
+    def GetMany(self, dois: list[str]) -> dict[str, str]:
+        result = {}
+        # Запросы частями, чтобы не превысить лимит параметров SQLite
+        for start in range(0, len(dois), 500):
+            part = dois[start:start + 500]
+            placeholders = ','.join('?' * len(part))
+            rows = self.connection.execute(f'SELECT doi, bibtex FROM doi_cache WHERE doi IN ({placeholders})', part)
+            result.update(rows.fetchall())
+        return result
+
+    def PutMany(self, entries: dict[str, str]):
+        now = time.time()
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO doi_cache (doi, bibtex, fetched_at) VALUES (?, ?, ?)',
+            [(doi, bibtex, now) for doi, bibtex in entries.items()]
+        )
+        self.connection.commit()
+
+    def Close(self):
+        self.connection.close()
+
+
+# Получение BibTeX по DOI: сначала из кэша, остальное - параллельными запросами.
+# Один пул соединений на все потоки, число одновременных запросов ограничено maxWorkers,
+# неудачные запросы повторяются с экспоненциальной задержкой
+class DOIResolver:
+    def __init__(self,
+                 cachePath: str,
+                 baseUrl: str = 'http://dx.doi.org',
+                 maxWorkers: int = 8,
+                 timeout: tuple[float, float] = (5, 30),
+                 retries: int = 3,
+                 backoff: float = 0.5):
+        self.cache = DOICache(cachePath)
+        self.baseUrl = baseUrl.rstrip('/')
+        self.maxWorkers = maxWorkers
+        self.timeout = timeout
+        retry = Retry(total=retries, backoff_factor=backoff, status_forcelist=RETRY_STATUSES, allowed_methods=['GET'])
+        adapter = HTTPAdapter(pool_connections=maxWorkers, pool_maxsize=maxWorkers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Accept'] = 'application/x-bibtex'
+        self._lock = threading.Lock()
+
+    # Запрос одной записи из сети, None если запись получить не удалось
+    def FetchBibTeX(self, doi: str) -> str | None:
+        try:
+            response = self.session.get(f'{self.baseUrl}/{doi}', allow_redirects=True, timeout=self.timeout)
+        except requests.RequestException:
+            return None
+        if response.ok:
+            return response.content.decode('utf-8')
+        return None
+
+    # Записи для набора DOI: {doi: bibtex или None}
+    def ResolveMany(self, dois: list[str]) -> dict[str, str | None]:
+        dois = list(dict.fromkeys(dois))
+        with self._lock:
+            result = self.cache.GetMany(dois)
+        missing = [doi for doi in dois if doi not in result]
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.maxWorkers) as executor:
+                fetched = dict(zip(missing, executor.map(self.FetchBibTeX, missing)))
+            with self._lock:
+                self.cache.PutMany({doi: bibtex for doi, bibtex in fetched.items() if bibtex is not None})
+            result.update(fetched)
+        return {doi: result[doi] for doi in dois}
+
+    def Resolve(self, doi: str) -> str | None:
+        return self.ResolveMany([doi])[doi]
+
+    def Close(self):
+        self.session.close()
+        self.cache.Close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+
+# Разбор BibTeX-записи в словарь полей
+def ParseBibTeX(bibtex: str | None) -> dict | None:
+    if not bibtex:
+        return None
+    entries = bibtexparser.loads(bibtex).entries
+    return entries[0] if entries else None
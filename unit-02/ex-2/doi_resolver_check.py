@@ -0,0 +1,89 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import tempfile
+import threading
+import time
+
+from doi_resolver import DOIResolver, ParseBibTeX
+
+# Проверка DOIResolver без сети: локальный HTTP-сервер-заглушка отвечает по сценарию для каждого DOI,
+# проверяются повторы при 429/5xx, задержка между повторами и кэш.
+#   python unit-02/ex-2/doi_resolver_check.py
+
+BIBTEX = '@article{{stub, title = {{Stub article}}, author = {{Ivanov, I.}}, year = {{2020}}, doi = {{{doi}}}}}'
+
+# Ответы заглушки по порядку запросов к DOI; после конца списка повторяется последний ответ
+SCENARIOS = {
+    '10.1000/ok': [200],
+    '10.1000/flaky': [500, 429, 200],
+    '10.1000/down': [503],
+    '10.1000/missing': [404],
+}
+
+RETRIES = 3
+BACKOFF = 0.05
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    hits: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        doi = self.path.lstrip('/')
+        with self.lock:
+            attempt = self.hits.get(doi, 0)
+            self.hits[doi] = attempt + 1
+        statuses = SCENARIOS.get(doi, [404])
+        status = statuses[min(attempt, len(statuses) - 1)]
+        body = BIBTEX.format(doi=doi).encode('utf-8') if status == 200 else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/x-bibtex')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    baseUrl = f'http://127.0.0.1:{server.server_port}'
+    dois = list(SCENARIOS)
+
+    try:
+        with tempfile.TemporaryDirectory() as folder, \
+                DOIResolver(os.path.join(folder, 'doi_cache.db'), baseUrl, maxWorkers=4, retries=RETRIES, backoff=BACKOFF) as resolver:
+            # Первый проход: каждый DOI запрашивается, ошибки 429/5xx повторяются
+            result = resolver.ResolveMany(dois)
+            assert ParseBibTeX(result['10.1000/ok'])['doi'] == '10.1000/ok'
+            assert ParseBibTeX(result['10.1000/flaky'])['doi'] == '10.1000/flaky'
+            assert result['10.1000/down'] is None and result['10.1000/missing'] is None
+            first = dict(StubHandler.hits)
+            # flaky: 500, 429, 200; down: первый запрос и RETRIES повторов; 404 не повторяется
+            assert first == {'10.1000/ok': 1, '10.1000/flaky': 3, '10.1000/down': RETRIES + 1, '10.1000/missing': 1}, first
+            print(f'Первый проход, запросов к заглушке: {first}')
+
+            # Второй проход: полученные записи берутся из кэша, неудачные запрашиваются снова
+            assert resolver.ResolveMany(dois) == result
+            second = {doi: StubHandler.hits[doi] - first[doi] for doi in dois}
+            assert second == {'10.1000/ok': 0, '10.1000/flaky': 0, '10.1000/down': RETRIES + 1, '10.1000/missing': 1}, second
+            print(f'Второй проход, запросов к заглушке: {second}')
+
+            # Задержки между повторами растут экспоненциально: 0, 2, 4 x BACKOFF (urllib3 2.x)
+            start = time.perf_counter()
+            assert resolver.FetchBibTeX('10.1000/down') is None
+            elapsed = time.perf_counter() - start
+            expected = BACKOFF * sum(2 ** i for i in range(1, RETRIES))
+            assert elapsed >= 0.9 * expected, elapsed
+            print(f'Повторы с задержкой: {elapsed:.3f} s (не меньше {expected:.3f} s)')
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print('Готово!')
+
+
+if __name__ == '__main__':
+    main()
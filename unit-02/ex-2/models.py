@@ -0,0 +1,54 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, Index, inspect, text
+from sqlalchemy.orm import relationship, declarative_base
+
+# Инициализация базы данных
+Base = declarative_base()
+
+# Определение таблицы категорий статей
+class ArticleCategory(Base):
+    __tablename__ = 'article_categories'
+    
+    id = Column(Integer, primary_key=True)
+    code = Column(String, nullable=False, unique=True)
+    title = Column(String, nullable=False)
+
+    articles = relationship('Article', back_populates='category')
+
+# Определение таблицы статей
+class Article(Base):
+    __tablename__ = 'articles'
+    
+    id = Column(Integer, primary_key=True)
+    author = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    journal = Column(String, nullable=False)
+    journalNumber = Column(Integer, nullable=False)
+    year = Column(Integer, nullable=False)
+    pages = Column(String, nullable=False)
+    doi = Column(String, nullable=False, unique=True)
+    
+    categoryId = Column(Integer, ForeignKey('article_categories.id'), nullable=False)
+    category = relationship('ArticleCategory', back_populates='articles')
+
+    # Составные индексы под фильтры и постраничную выборку в article_query: id в конце ключа
+    # задает порядок внутри одинаковых значений, поэтому сортировка берется из индекса
+    __table_args__ = (
+        Index('ix_articles_year_id', 'year', 'id'),
+        Index('ix_articles_category_year_id', 'categoryId', 'year', 'id'),
+        Index('ix_articles_journal_year_id', 'journal', 'year', 'id'),
+        Index('ix_articles_author_id', 'author', 'id'),
+    )
+
+# Создание таблиц и индексов. create_all не меняет уже существующие таблицы, поэтому в базе, созданной
+# до появления индексов, они добавляются отдельно; повторный вызов ничего не меняет
+def EnsureSchema(engine):
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for index in Article.__table__.indexes:
+            index.create(connection, checkfirst=True)
+        # Уникальность doi в новой таблице задана ограничением UNIQUE, в старой - добавляется индексом
+        inspector = inspect(connection)
+        unique = [constraint['column_names'] for constraint in inspector.get_unique_constraints('articles')]
+        unique += [index['column_names'] for index in inspector.get_indexes('articles') if index['unique']]
+        if ['doi'] not in unique:
+            connection.execute(text('CREATE UNIQUE INDEX IF NOT EXISTS ix_articles_doi ON articles (doi)'))
@@ -0,0 +1,81 @@
+from dataclasses import asdict
+from itertools import islice
+from typing import Iterable
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.dialects.sqlite import insert
+
+from models import Base, Compound, Thermodynamic
+
+# Настройки SQLite на время загрузки: журнал WAL и синхронизация без fsync на каждую транзакцию
+LOADING_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-65536',
+)
+
+# Поля Thermodynamic, которые обновляются при повторной загрузке вещества
+THERMODYNAMIC_FIELDS = ('delta_ho_298', 'so_298', 't_min', 't_max', 'a', 'b', 'c', 'd')
+
+
+# Движок SQLite, каждое соединение которого настраивается для загрузки
+def create_loading_engine(url: str):
+    engine = create_engine(url)
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in LOADING_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return engine
+
+
+# Схема без удаления данных. Уникальные индексы по формуле нужны для upsert,
+# в базах, созданных до их появления, индексы добавляются отдельно
+def ensure_schema(engine):
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text('CREATE UNIQUE INDEX IF NOT EXISTS ix_compound_formula ON compound (formula)'))
+        connection.execute(text('CREATE UNIQUE INDEX IF NOT EXISTS ix_thermodynamic_formula ON thermodynamic (formula)'))
+
+
+# Запись пачки записей (объектов с полями CompoundRecord) через Core executemany.
+# Таблицы пишутся в порядке зависимостей: сначала compound, затем thermodynamic с найденными compound_id.
+# При upsert=True существующие вещества (по формуле) обновляются, иначе дубликаты вызывают ошибку
+def write_batch(connection, records: list, upsert: bool = True):
+    if not records:
+        return
+    rows = [asdict(record) for record in records]
+
+    compound_insert = insert(Compound)
+    if upsert:
+        compound_insert = compound_insert.on_conflict_do_update(
+            index_elements=['formula'], set_={'name': compound_insert.excluded.name})
+    connection.execute(compound_insert, [{'name': row['name'], 'formula': row['formula']} for row in rows])
+
+    formulas = [row['formula'] for row in rows]
+    ids = dict(connection.execute(select(Compound.formula, Compound.id).where(Compound.formula.in_(formulas))).all())
+
+    thermodynamic_insert = insert(Thermodynamic)
+    if upsert:
+        thermodynamic_insert = thermodynamic_insert.on_conflict_do_update(
+            index_elements=['formula'],
+            set_={field: getattr(thermodynamic_insert.excluded, field) for field in THERMODYNAMIC_FIELDS + ('compound_id',)})
+    connection.execute(thermodynamic_insert, [
+        {'formula': row['formula'], 'compound_id': ids[row['formula']], **{field: row[field] for field in THERMODYNAMIC_FIELDS}}
+        for row in rows
+    ])
+
+
+# Загрузка потока записей одной транзакцией, пачками по batch_size. Возвращает число записей
+def bulk_load(engine, records: Iterable, upsert: bool = True, batch_size: int = 1000) -> int:
+    ensure_schema(engine)
+    records = iter(records)
+    count = 0
+    with engine.begin() as connection:
+        while batch := list(islice(records, batch_size)):
+            write_batch(connection, batch, upsert)
+            count += len(batch)
+    return count
@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+import numpy as np
+
+
+def r2_score(y_true, y_pred, axis: int = -1):
+    # Сумма квадратов остатка (SSR)
+    ss_res = np.sum((y_true - y_pred) ** 2, axis=axis)
+
+    # Сумма квадратов отклонений от среднего (SST)
+    ss_tot = np.sum((y_true - np.mean(y_true, axis=axis, keepdims=True)) ** 2, axis=axis)
+
+    # Коэффициент детерминации R^2
+    return 1 - ss_res / ss_tot
+
+
+# Матрица плана для Cp = a + b*1e-3*T + c*1e5*T^-2 + d*1e-6*T^2: функция линейна по a, b, c, d
+def design_matrix(T) -> np.ndarray:
+    T = np.asarray(T, dtype=float)
+    return np.stack([np.ones_like(T), 1e-3 * T, 1e5 * np.pow(T, -2), 1e-6 * np.pow(T, 2)], axis=-1)
+
+
+# Результат аппроксимации набора веществ
+@dataclass
+class FitResult:
+    coefficients: np.ndarray  # (вещества x 4): a, b, c, d
+    r2: np.ndarray  # (вещества)
+    residuals: list[np.ndarray]  # остатки Cp - Cp_fit для каждого вещества
+    covariance: np.ndarray  # (вещества x 4 x 4)
+
+
+# Аппроксимация сразу всех веществ линейным МНК через одно пакетное QR-разложение.
+# Таблицы разной длины дополняются нулевыми строками, которые не влияют на решение
+def fit_library(temperatures: list[np.ndarray], heat_capacities: list[np.ndarray]) -> FitResult:
+    temperatures = [np.asarray(T, dtype=float) for T in temperatures]
+    heat_capacities = [np.asarray(Cp, dtype=float) for Cp in heat_capacities]
+    counts = np.array([len(T) for T in temperatures])
+    n_max = counts.max()
+
+    X = np.zeros((len(temperatures), n_max, 4))
+    Y = np.zeros((len(temperatures), n_max))
+    for i, (T, Cp) in enumerate(zip(temperatures, heat_capacities)):
+        X[i, :len(T)] = design_matrix(T)
+        Y[i, :len(T)] = Cp
+
+    Q, R = np.linalg.qr(X)
+    coefficients = np.linalg.solve(R, np.einsum('mnk,mn->mk', Q, Y)[..., np.newaxis])[..., 0]
+
+    residuals = [Cp - design_matrix(T) @ c for T, Cp, c in zip(temperatures, heat_capacities, coefficients)]
+    r2 = np.array([r2_score(Cp, Cp - e) for Cp, e in zip(heat_capacities, residuals)])
+
+    # Ковариация параметров: sigma^2 (R^T R)^-1, sigma^2 = SSR / (n - 4)
+    sigma2 = np.array([np.sum(e ** 2) for e in residuals]) / np.maximum(counts - 4, 1)
+    R_inv = np.linalg.inv(R)
+    covariance = sigma2[:, np.newaxis, np.newaxis] * (R_inv @ np.swapaxes(R_inv, -1, -2))
+
+    return FitResult(coefficients, r2, residuals, covariance)
+
+
+# Аппроксимация одного вещества, возвращает a, b, c, d
+def fit_heat_capacity(T, Cp) -> np.ndarray:
+    return fit_library([T], [Cp]).coefficients[0]
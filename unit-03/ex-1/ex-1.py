@@ -1,26 +1,17 @@
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import os
-from scipy.optimize import curve_fit
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
-import re
+import sys
+from sqlalchemy.orm import sessionmaker
 from tabulate import tabulate
-import numpy as np
 
-def r2_score(y_true, y_pred):
-    # Сумма квадратов остатка (SSR)
-    ss_res = np.sum((y_true - y_pred) ** 2)
-    
-    # Сумма квадратов отклонений от среднего (SST)
-    ss_tot = np.sum((y_true - np.mean(y_true)) ** 2)
-    
-    # Коэффициент детерминации R^2
-    r2 = 1 - (ss_res / ss_tot)
-    
-    return r2
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'unit-04', 'ex-3'))
+
+from bulk_load import bulk_load, create_loading_engine
+from cp_fit import fit_heat_capacity
+from ingest import discover_files, fit_points, iter_records, read_table
+from surrogate import error_report
+from models import Compound, Thermodynamic
+from rendering import FigureSpec, Panel, render
 
 
 # Заданная функция теплоемкости
@@ -29,68 +20,22 @@ def heat_capacity_function(T: float, a, b, c, d) -> float:
 
 # Функция для аппроксимации конкретной функцией
 def fit_custom_function(x, y):
-    # Начальные приближения для параметров
-    initial_guess = [1, 1, 0, 0]
-    
-    # Подбор параметров с помощью curve_fit
-    params, covariance = curve_fit(heat_capacity_function, x, y, p0=initial_guess)
-
-    return params
-
-# Функция для построения графиков
-def plot_data_with_fit(temperatures, heat_capacities, fit_func, params, substance_name, r2):
-    # Параметры графика
-    plt.scatter(temperatures, heat_capacities, label=f'{substance_name} data', marker='o')
-    plt.plot(temperatures, fit_func(temperatures, *params), label=f'{substance_name} fit, R²={r2:.4f}')
-    plt.xlabel('T (K)')
-    plt.ylabel('Cp (J/(mol*K))')
-    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-
-
-# Базовый класс для декларативных классов
-Base = declarative_base()
-
-# Определение таблицы Compound
-class Compound(Base):
-    __tablename__ = 'compound'
-
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String, nullable=False)
-    formula = Column(String, nullable=False)
-
-    # Один к одному: связь с таблицей Thermodynamic
-    thermodynamic = relationship("Thermodynamic", uselist=False, back_populates="compound")
-
-# Определение таблицы Thermodynamic
-class Thermodynamic(Base):
-    __tablename__ = 'thermodynamic'
-
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    formula = Column(String, nullable=False)
-    delta_ho_298 = Column(Float, nullable=False)
-    so_298 = Column(Float, nullable=False)
-    t_min = Column(Float, nullable=False)
-    t_max = Column(Float, nullable=False)
-    a = Column(Float, nullable=False)
-    b = Column(Float, nullable=False)
-    c = Column(Float, nullable=False)
-    d = Column(Float, nullable=False)
-
-    # Связь с таблицей Compound
-    compound_id = Column(Integer, ForeignKey('compound.id'))
-    compound = relationship("Compound", back_populates="thermodynamic")
-
-# Функция для извлечения названия и формулы из имени файла
-def extract_name_and_formula(filename):
-    # Используем регулярное выражение для извлечения названия и формулы
-    match = re.match(r"(.+?) \((.+?)\)", filename)
-    if match:
-        name = match.group(1).strip()
-        formula = match.group(2).strip()
-        return name, formula
-    else:
-        raise ValueError(f"Неверный формат названия файла: {filename}")
-    
+    # Функция линейна по параметрам, поэтому решается линейный МНК без начального приближения
+    return fit_heat_capacity(x, y)
+
+# Функция для построения графиков: точки таблиц и аппроксимации всех веществ на одной панели.
+# Кривая аппроксимации считается на сетке из N точек диапазона каждого вещества
+def plot_data_with_fit(temperatures, heat_capacities, fit_func, params, substance_names, r2, path, N=200):
+    T = np.array([np.linspace(t.min(), t.max(), N) for t in temperatures])
+    Cp = np.array([fit_func(T_i, *p) for T_i, p in zip(T, params)])
+    labels = [f'{name}, R²={value:.4f}' for name, value in zip(substance_names, r2)]
+    render(FigureSpec([
+        Panel(T, Cp, labels, title='Теплоемкость от температуры', xlabel='T (K)', ylabel='Cp (J/(mol*K))',
+              points_x=temperatures, points_y=heat_capacities,
+              legend=dict(bbox_to_anchor=(1.05, 1), loc='upper left'), grid=True),
+    ], path, size=(15, 6), margins=dict(right=3.0)))
+
+
 # Функция для извлечения и вывода данных из таблиц
 def print_data_from_tables(engine):
     Session = sessionmaker(bind=engine)
@@ -123,92 +68,35 @@ def print_data_from_tables(engine):
 
 # Главная функция для обработки и визуализации
 def main():
-    root_folder = 'unit-03\\ex-1\\data'
+    root_folder = os.path.join('unit-03', 'ex-1', 'data')
     # Список файлов с данными
-    files = [x for x in os.listdir(root_folder) if x.endswith('.csv')]
-    plt.figure(figsize=(15, 6))
+    files = discover_files(root_folder)
 
     # Создаем подключение к базе данных SQLite (можно заменить на другую БД, например, PostgreSQL)
-    engine = create_engine('sqlite:///unit-03/ex-1/unit-03.db')
+    engine = create_loading_engine('sqlite:///unit-03/ex-1/unit-03.db')
 
-    # Пересоздание всех таблиц
-    Base.metadata.drop_all(engine)  # Удаление существующих таблиц
-    Base.metadata.create_all(engine)  # Создание новых таблиц
+    # Чтение, фильтрация 298-2000K, аппроксимация и значения при 298 K - как при импорте папки (ingest),
+    # в одном процессе, чтобы записи шли в порядке файлов
+    records = list(iter_records(files, processes=1))
 
-    # Создаем сессию для взаимодействия с базой данных
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    # Все вещества записываются одной транзакцией, существующие обновляются по формуле
+    bulk_load(engine, records)
 
-    # Обработка каждого файла
-    for file in files:
-        # Чтение данных
-        data = pd.read_csv(f'{root_folder}\\{file}')
-        # Перевод в Дж/Мол/К
-        data['Cp(cal/mol/K)'] *= 4.1868
-        
-        # Фильтрация данных в диапазоне 298-2000K
-        mask = (data['T (K)'] >= 298) & (data['T (K)'] <= 2000)
-        temperatures_filtered = data['T (K)'][mask]
-        heat_capacities_filtered = data['Cp(cal/mol/K)'][mask]
-
-        # Аппроксимация конкретной функцией
-        params = fit_custom_function(temperatures_filtered, heat_capacities_filtered)
-        
-        # Предсказание значений теплоемкости по аппроксимированной функции
-        heat_capacity_pred = heat_capacity_function(temperatures_filtered, *params)
-
-        # Оценка R^2
-        r2 = r2_score(heat_capacities_filtered, heat_capacity_pred)
-
-        # Название вещества (берем из имени файла)
-        name, formula = extract_name_and_formula(file)
-
-        # Построение графика
-        plot_data_with_fit(temperatures_filtered, heat_capacities_filtered, heat_capacity_function, params, formula, r2)
-
-        # Добавляем данные в таблицу Compound
-        compound = Compound(name=name, formula=formula)
-        session.add(compound)
-        session.commit()
-
-        # Ищем строку, где T(K) == 298 для получения delta_ho_298 и so_298
-        row_298 = data.loc[data['T (K)'] == 298]
-
-        # Извлекаем нужные значения при T = 298
-        delta_ho_298 = row_298['dH (kcal/mol)'].values[0]
-        so_298 = row_298['S(cal/mol/K)'].values[0]
-        # Получаем максимальную и минимальную температуры
-        t_min = temperatures_filtered.min()
-        t_max = temperatures_filtered.max()
-
-        # Параметры функции аппроксимации
-        a, b, c, d = params
-
-        # Добавляем данные в таблицу Thermodynamic
-        thermodynamic = Thermodynamic(
-            formula=formula,
-            delta_ho_298=delta_ho_298,
-            so_298=so_298,
-            t_min=t_min,
-            t_max=t_max,
-            a=a,
-            b=b,
-            c=c,
-            d=d,
-            compound_id=compound.id  # Связываем с compound через ForeignKey
-        )
-        session.add(thermodynamic)
-        session.commit()
-
-    # Отображение графика
-    plt.title('Теплоемкость от температуры')
-    plt.grid(True)
-    plt.tight_layout()
-    plt.savefig('unit-03\\ex-1\\plot.png')
+    # Построение графика: точки таблиц (из кэша) и аппроксимации всех веществ одной фигурой
+    temperatures, heat_capacities = zip(*(fit_points(read_table(path)) for path in files))
+    plot_data_with_fit(temperatures, heat_capacities, heat_capacity_function,
+                       [(record.a, record.b, record.c, record.d) for record in records],
+                       [record.formula for record in records], [record.r2 for record in records],
+                       os.path.join('unit-03', 'ex-1', 'plot.png'))
 
     # Выводим данные
     print_data_from_tables(engine)
 
+    # Сплайны по полным таблицам (сохраняются на диск) и их сравнение с полиномом
+    print("\nСплайн и полином, максимальная ошибка Cp (Дж/(моль K)):")
+    report = [[row['name'], row['spline_error'], row['polynomial_error'], row['difference']] for row in error_report(root_folder)]
+    print(tabulate(report, headers=["Name", "Spline", "Polynomial", "Spline - polynomial"], tablefmt="grid", floatfmt=".3e"))
+
 # Запуск программы
 if __name__ == "__main__":
     main()
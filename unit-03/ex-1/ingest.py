@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Iterator
+import numpy as np
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'unit-04', 'ex-3'))
+
+from bulk_load import bulk_load, create_loading_engine
+from cp_fit import fit_library
+from table_cache import load_table
+
+# Колонки JANAF-таблиц, которые нужны для расчета (остальные не читаются)
+COLUMNS = ('T (K)', 'Cp(cal/mol/K)', 'S(cal/mol/K)', 'dH (kcal/mol)')
+
+# Диапазон аппроксимации теплоемкости, K
+T_FIT_MIN = 298
+T_FIT_MAX = 2000
+
+
+# Запись для таблиц Compound и Thermodynamic (dH в ккал/моль, S в кал/(моль K), как в исходных таблицах)
+@dataclass(frozen=True, slots=True)
+class CompoundRecord:
+    name: str
+    formula: str
+    delta_ho_298: float
+    so_298: float
+    t_min: float
+    t_max: float
+    a: float
+    b: float
+    c: float
+    d: float
+    r2: float
+
+
+# Функция для извлечения названия и формулы из имени файла
+def extract_name_and_formula(filename):
+    # Используем регулярное выражение для извлечения названия и формулы
+    match = re.match(r"(.+?) \((.+?)\)", filename)
+    if match:
+        name = match.group(1).strip()
+        formula = match.group(2).strip()
+        return name, formula
+    else:
+        raise ValueError(f"Неверный формат названия файла: {filename}")
+
+
+# Поиск csv-файлов в папке (не зависит от разделителя путей в ОС)
+def discover_files(root_folder: str) -> list[Path]:
+    return sorted(Path(root_folder).glob('*.csv'))
+
+
+# Нужные колонки в виде массива float64 (строки x COLUMNS). Таблица читается из бинарного кэша (memmap),
+# CSV разбирается только при первом чтении или после изменения файла
+def read_table(path) -> np.ndarray:
+    return load_table(str(path)).stack(COLUMNS)
+
+
+# Точки аппроксимации таблицы: температуры в диапазоне T_FIT_MIN..T_FIT_MAX и Cp в Дж/(моль K)
+def fit_points(table: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    T = table[:, 0]
+    mask = (T >= T_FIT_MIN) & (T <= T_FIT_MAX)
+    # Перевод в Дж/Мол/К
+    return T[mask], table[mask, 1] * 4.1868
+
+
+# Обработка группы файлов: чтение, аппроксимация одним пакетным МНК, значения при 298 K
+def process_files(paths: list[Path]) -> list[CompoundRecord]:
+    tables = [read_table(path) for path in paths]
+    points = [fit_points(table) for table in tables]
+    temperatures = [T for T, _ in points]
+    fit = fit_library(temperatures, [Cp for _, Cp in points])
+
+    records = []
+    for path, table, T_fit, params, r2 in zip(paths, tables, temperatures, fit.coefficients, fit.r2):
+        name, formula = extract_name_and_formula(Path(path).name)
+        # Температуры в таблице отсортированы, поэтому строка 298 K ищется бинарным поиском
+        i = np.searchsorted(table[:, 0], 298)
+        if i == len(table) or table[i, 0] != 298:
+            raise ValueError(f"Нет данных при T = 298 K: {path}")
+        a, b, c, d = params
+        records.append(CompoundRecord(
+            name=name,
+            formula=formula,
+            delta_ho_298=float(table[i, 3]),
+            so_298=float(table[i, 2]),
+            t_min=float(T_fit.min()),
+            t_max=float(T_fit.max()),
+            a=float(a),
+            b=float(b),
+            c=float(c),
+            d=float(d),
+            r2=float(r2),
+        ))
+    return records
+
+
+# Поток обработанных записей. Файлы делятся на группы по chunksize и обрабатываются в пуле процессов,
+# результаты выдаются по мере готовности
+def iter_records(files: list[Path], processes: int | None = None, chunksize: int = 64) -> Iterator[CompoundRecord]:
+    chunks = [files[i:i + chunksize] for i in range(0, len(files), chunksize)]
+    if processes == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from process_files(chunk)
+        return
+    with Pool(processes) as pool:
+        for records in pool.imap_unordered(process_files, chunks):
+            yield from records
+
+
+# Импорт папки с таблицами в базу: разбор и аппроксимация в пуле процессов,
+# запись потоком в одной транзакции пачками по batch_size. Возвращает число загруженных веществ
+def ingest(root_folder: str, engine, processes: int | None = None, chunksize: int = 64,
+           batch_size: int = 1000, upsert: bool = True) -> int:
+    records = iter_records(discover_files(root_folder), processes, chunksize)
+    return bulk_load(engine, records, upsert, batch_size)
+
+
+if __name__ == "__main__":
+    folder = os.path.dirname(os.path.abspath(__file__))
+    engine = create_loading_engine(f"sqlite:///{os.path.join(folder, 'unit-03.db')}")
+    start = time.perf_counter()
+    count = ingest(os.path.join(folder, 'data'), engine)
+    print(f"Загружено веществ: {count}, время: {time.perf_counter() - start:.3f} s")
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+# Базовый класс для декларативных классов
+Base = declarative_base()
+
+# Определение таблицы Compound
+class Compound(Base):
+    __tablename__ = 'compound'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False)
+    # Формула - ключ для дозаписи (upsert) в bulk_load
+    formula = Column(String, nullable=False, unique=True, index=True)
+
+    # Один к одному: связь с таблицей Thermodynamic
+    thermodynamic = relationship("Thermodynamic", uselist=False, back_populates="compound")
+
+# Определение таблицы Thermodynamic
+class Thermodynamic(Base):
+    __tablename__ = 'thermodynamic'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    formula = Column(String, nullable=False, unique=True, index=True)
+    delta_ho_298 = Column(Float, nullable=False)
+    so_298 = Column(Float, nullable=False)
+    t_min = Column(Float, nullable=False)
+    t_max = Column(Float, nullable=False)
+    a = Column(Float, nullable=False)
+    b = Column(Float, nullable=False)
+    c = Column(Float, nullable=False)
+    d = Column(Float, nullable=False)
+
+    # Связь с таблицей Compound
+    compound_id = Column(Integer, ForeignKey('compound.id'))
+    compound = relationship("Compound", back_populates="thermodynamic")
@@ -0,0 +1,252 @@
+from dataclasses import dataclass
+from pathlib import Path
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'unit-04', 'ex-3'))
+
+from cp_fit import design_matrix, fit_library
+from ingest import T_FIT_MAX, T_FIT_MIN, discover_files, extract_name_and_formula, read_table
+from table_cache import CACHE_DIR
+from thermodynamic import check_range
+
+# Суррогат свойств по табличным данным JANAF: сплайны Cp(T) и S(T) по всем точкам таблицы (от 0 K),
+# H(T) - точный интеграл сплайна Cp от 298 K, G = H - T S.
+# Узлы и коэффициенты сплайнов строятся один раз (scipy нужен только здесь) и сохраняются в
+# data/__tablecache__/surrogate-<method>.npz; запрос свойства - бинарный поиск участка и схема Горнера
+SPLINE_METHODS = ('pchip', 'cubic')
+
+# Перевод калорий в джоули
+CAL_TO_J = 4.1868
+
+# Опорная температура стандартных значений в таблицах, K
+T_REF = 298.0
+
+VERSION = 1
+
+
+# Сплайны одного вещества. knots - узлы (n), Cp, S - коэффициенты кубических участков (4 x n-1)
+# в локальной переменной T - knots[i] (старшая степень первой), Cp и S в Дж/(моль K).
+# Cp_integral - интеграл Cp от knots[0] до каждого узла, Дж/моль; Delta_H - dH°f(298), кДж/моль
+@dataclass
+class SplineTable:
+    Name: str
+    Formula: str
+    knots: np.ndarray
+    Cp: np.ndarray
+    S: np.ndarray
+    Cp_integral: np.ndarray
+    Delta_H: float
+
+    @property
+    def T_min(self) -> float:
+        return float(self.knots[0])
+
+    @property
+    def T_max(self) -> float:
+        return float(self.knots[-1])
+
+    def in_range(self, T) -> np.ndarray:
+        T = np.asarray(T, dtype=float)
+        return (T >= self.knots[0]) & (T <= self.knots[-1])
+
+    # Номер участка и расстояние от его левого узла
+    def _locate(self, T: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        index = np.clip(np.searchsorted(self.knots, T, side='right') - 1, 0, len(self.knots) - 2)
+        return index, T - self.knots[index]
+
+    @staticmethod
+    def _horner(c: np.ndarray, dx: np.ndarray) -> np.ndarray:
+        return ((c[0] * dx + c[1]) * dx + c[2]) * dx + c[3]
+
+    def heat_capacity(self, T) -> np.ndarray:
+        index, dx = self._locate(np.asarray(T, dtype=float))
+        return self._horner(self.Cp[:, index], dx)
+
+    def entropy(self, T) -> np.ndarray:
+        index, dx = self._locate(np.asarray(T, dtype=float))
+        return self._horner(self.S[:, index], dx)
+
+    # Интеграл Cp от knots[0] до T: накопленное значение в узле плюс интеграл кубического участка
+    def _integral(self, T: np.ndarray) -> np.ndarray:
+        index, dx = self._locate(T)
+        c = self.Cp[:, index]
+        return self.Cp_integral[index] + dx * (((c[0] / 4 * dx + c[1] / 3) * dx + c[2] / 2) * dx + c[3])
+
+    # H = dH°f(298) + int_298^T Cp dT, кДж/моль
+    def enthalpy(self, T) -> np.ndarray:
+        T = np.asarray(T, dtype=float)
+        return self.Delta_H + 1e-3 * (self._integral(T) - self._integral(np.asarray(T_REF)))
+
+    def gibbs_energy(self, T) -> np.ndarray:
+        T = np.asarray(T, dtype=float)
+        return self.enthalpy(T) - T * self.entropy(T) * 1e-3
+
+
+# Кусочно-кубический сплайн по точкам: коэффициенты (4 x n-1). scipy импортируется только при построении
+def _spline(x: np.ndarray, y: np.ndarray, method: str) -> np.ndarray:
+    from scipy import interpolate
+    if method == 'pchip':
+        return interpolate.PchipInterpolator(x, y).c
+    if method == 'cubic':
+        return interpolate.CubicSpline(x, y).c
+    raise ValueError(f'Неизвестный метод сплайна: {method}')
+
+
+def build_table(path, method: str = 'pchip') -> SplineTable:
+    table = read_table(path)
+    T, Cp, S = table[:, 0], table[:, 1] * CAL_TO_J, table[:, 2] * CAL_TO_J
+    i = np.searchsorted(T, T_REF)
+    if i == len(T) or T[i] != T_REF:
+        raise ValueError(f"Нет данных при T = {T_REF:g} K: {path}")
+    name, formula = extract_name_and_formula(Path(path).name)
+    coefficients = _spline(T, Cp, method)
+    dx = np.diff(T)
+    segments = dx * (((coefficients[0] / 4 * dx + coefficients[1] / 3) * dx + coefficients[2] / 2) * dx + coefficients[3])
+    return SplineTable(
+        Name=name,
+        Formula=formula,
+        knots=T.copy(),
+        Cp=coefficients,
+        S=_spline(T, S, method),
+        Cp_integral=np.concatenate([[0.0], np.cumsum(segments)]),
+        Delta_H=float(table[i, 3]) * CAL_TO_J,
+    )
+
+
+def _signature(paths: list[Path]) -> list[list]:
+    return [[path.name, os.stat(path).st_mtime_ns, os.stat(path).st_size] for path in paths]
+
+
+def _save(path: str, tables: list[SplineTable], header: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    arrays = {'header': np.array(json.dumps(header, ensure_ascii=False))}
+    for i, table in enumerate(tables):
+        for field in ('knots', 'Cp', 'S', 'Cp_integral'):
+            arrays[f'{i}/{field}'] = getattr(table, field)
+    temporary = f'{path}.{os.getpid()}.tmp.npz'
+    np.savez(temporary, **arrays)
+    os.replace(temporary, path)
+
+
+def _load(path: str, signature: list[list]) -> list[SplineTable] | None:
+    try:
+        with np.load(path) as data:
+            header = json.loads(str(data['header']))
+            if header.get('version') != VERSION or header.get('sources') != signature:
+                return None
+            return [SplineTable(Name=name, Formula=formula, Delta_H=delta_h,
+                                **{field: data[f'{i}/{field}'] for field in ('knots', 'Cp', 'S', 'Cp_integral')})
+                    for i, (name, formula, delta_h) in enumerate(header['compounds'])]
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+# Суррогат для всех таблиц папки. Сохраненные сплайны используются, пока не изменились исходные файлы
+class PropertySurrogate:
+    def __init__(self, tables: list[SplineTable]):
+        self.tables = tables
+        self._by_name = {}
+        for table in tables:
+            self._by_name.setdefault(table.Name, table)
+            self._by_name.setdefault(table.Formula, table)
+
+    @classmethod
+    def from_folder(cls, root_folder: str, method: str = 'pchip') -> 'PropertySurrogate':
+        paths = discover_files(root_folder)
+        signature = _signature(paths)
+        path = os.path.join(root_folder, CACHE_DIR, f'surrogate-{method}.npz')
+        tables = _load(path, signature)
+        if tables is None:
+            tables = [build_table(file, method) for file in paths]
+            header = {
+                'version': VERSION,
+                'method': method,
+                'sources': signature,
+                'compounds': [[table.Name, table.Formula, table.Delta_H] for table in tables],
+            }
+            try:
+                _save(path, tables, header)
+            except OSError:
+                pass
+        return cls(tables)
+
+    def __getitem__(self, key: str) -> SplineTable:
+        if key not in self._by_name:
+            raise KeyError(f'Вещество не найдено: {key}')
+        return self._by_name[key]
+
+    @property
+    def names(self) -> list[str]:
+        return [table.Name for table in self.tables]
+
+    # Cp, H, S, G веществ на сетке температур (вещества x N): Cp, S в Дж/(моль K), H, G в кДж/моль.
+    # Вне табличного диапазона - по правилу on_range (см. thermodynamic)
+    def properties(self, names: list[str], T, on_range: str = 'raise') -> dict[str, np.ndarray]:
+        T = np.atleast_1d(np.asarray(T, dtype=float))
+        tables = [self[name] for name in names]
+        inside = np.array([table.in_range(T) for table in tables]).reshape(len(tables), len(T))
+        check_range(tables, inside, T, on_range)
+        result = {
+            'Cp': np.array([table.heat_capacity(T) for table in tables]).reshape(len(tables), len(T)),
+            'H': np.array([table.enthalpy(T) for table in tables]).reshape(len(tables), len(T)),
+            'S': np.array([table.entropy(T) for table in tables]).reshape(len(tables), len(T)),
+        }
+        result['G'] = result['H'] - T * result['S'] * 1e-3
+        if on_range == 'nan':
+            result = {key: np.where(inside, value, np.nan) for key, value in result.items()}
+        return result
+
+
+# Сравнение сплайна с полиномом Cp = a + b*1e-3*T + c*1e5*T^-2 + d*1e-6*T^2 (диапазон T_FIT_MIN..T_FIT_MAX).
+# Для каждого вещества, Дж/(моль K):
+#   spline_error     - оценка ошибки интерполяции сверху: сплайн по каждому второму узлу (шаг вдвое больше)
+#                      в выброшенных узлах диапазона аппроксимации,
+#   polynomial_error - наибольшее отклонение полинома от таблицы в диапазоне аппроксимации,
+#   difference       - наибольшее расхождение сплайна и полинома на плотной сетке этого диапазона
+def error_report(root_folder: str, method: str = 'pchip', points: int = 1000) -> list[dict]:
+    paths = discover_files(root_folder)
+    surrogate = PropertySurrogate.from_folder(root_folder, method)
+    tables = [read_table(path) for path in paths]
+    masks = [(table[:, 0] >= T_FIT_MIN) & (table[:, 0] <= T_FIT_MAX) for table in tables]
+    fit = fit_library([table[mask, 0] for table, mask in zip(tables, masks)],
+                      [table[mask, 1] * CAL_TO_J for table, mask in zip(tables, masks)])
+    rows = []
+    for spline, table, mask, coefficients, residuals in zip(surrogate.tables, tables, masks, fit.coefficients, fit.residuals):
+        T, Cp = table[:, 0], table[:, 1] * CAL_TO_J
+        # Крайние узлы сохраняются, чтобы проверка оставалась интерполяцией
+        keep = np.zeros(len(T), dtype=bool)
+        keep[::2] = keep[-1] = True
+        coarse = SplineTable(spline.Name, spline.Formula, T[keep], _spline(T[keep], Cp[keep], method),
+                             np.zeros((4, keep.sum() - 1)), np.zeros(keep.sum()), spline.Delta_H)
+        grid = np.linspace(max(T_FIT_MIN, spline.T_min), min(T_FIT_MAX, spline.T_max), points)
+        rows.append({
+            'name': spline.Name,
+            'spline_error': float(np.max(np.abs(coarse.heat_capacity(T[~keep & mask]) - Cp[~keep & mask]))),
+            'polynomial_error': float(np.max(np.abs(residuals))),
+            'difference': float(np.max(np.abs(spline.heat_capacity(grid) - design_matrix(grid) @ coefficients))),
+            'below_298': bool(spline.T_min < T_FIT_MIN),
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    from tabulate import tabulate
+
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    start = time.perf_counter()
+    surrogate = PropertySurrogate.from_folder(folder)
+    print(f"Сплайны {len(surrogate.tables)} веществ: {time.perf_counter() - start:.4f} s")
+
+    T = np.linspace(50, 2000, 100000)
+    start = time.perf_counter()
+    result = surrogate.properties(surrogate.names, T)
+    print(f"Cp, H, S, G для {len(surrogate.tables)} веществ x {len(T)} температур: {time.perf_counter() - start:.4f} s")
+
+    print(tabulate([list(row.values()) for row in error_report(folder)],
+                   headers=['Вещество', 'Сплайн', 'Полином', 'Сплайн - полином', 'Ниже 298 K'],
+                   tablefmt='grid', floatfmt='.3e'))
@@ -0,0 +1,143 @@
+from scipy import integrate
+from tabulate import tabulate
+import numpy as np
+import timeit
+
+from cubature import cubature
+from quadrature import gauss_hermite, gauss_kronrod, gauss_laguerre, tanh_sinh
+
+# Тестовые интегралы из ex-1.py: подынтегральная функция, пределы, параметры и точное значение.
+# Для Гаусса-Лагерра/Эрмита задается функция g без весового множителя (exp(-x) или exp(-x^2))
+CASES = {
+    '1. 1 / (x sqrt(1 + ln x))': dict(
+        f=lambda x: 1.0 / (x * np.sqrt(1 + np.log(x))), a=1.0, b=np.exp(3), exact=2.0),
+    '2. (exp(-x) - exp(-t x)) / x, t = 1..3': dict(
+        f=lambda x, t: (np.exp(-x) - np.exp(-t * x)) / x, a=0.0, b=np.inf, args=(np.linspace(1, 3, 3),),
+        exact=np.log(np.linspace(1, 3, 3)),
+        laguerre=lambda x, t: -np.expm1(-(t - 1) * x) / x),
+    '3. x^(1/pi) / x / (1 + x)': dict(
+        f=lambda x: np.pow(x, 1 / np.pi) / x / (1 + x), a=0.0, b=np.inf, exact=np.pi / np.sin(1)),
+    '4. exp(-x^2)': dict(
+        f=lambda x: np.exp(-np.pow(x, 2)), a=-np.inf, b=np.inf, exact=np.sqrt(np.pi),
+        hermite=lambda x: np.ones_like(x)),
+}
+
+# Кратные интегралы: f(x0, x1, ...) и пределы limits в порядке cubature (внешняя переменная первая).
+# Если точное значение неизвестно, эталон - dblquad/tplquad с допуском 1e-14
+MULTI_CASES = {
+    '5. x y^2, 2 - y <= x <= sqrt(4 - y^2)': dict(
+        f=lambda y, x: x * np.pow(y, 2),
+        limits=[(0.0, 2.0), (lambda y: 2 - y, lambda y: np.sqrt(4 - np.pow(y, 2)))], exact=8 / 5),
+    '6. exp(-x y) cos(3x + y) sqrt(x), та же область': dict(
+        f=lambda y, x: np.exp(-x * y) * np.cos(3 * x + y) * np.sqrt(x),
+        limits=[(0.0, 2.0), (lambda y: 2 - y, lambda y: np.sqrt(4 - np.pow(y, 2)))]),
+    '7. exp(-(x y + z)) sin(x + 2z), 0 <= y <= x, 0 <= z <= x + y': dict(
+        f=lambda x, y, z: np.exp(-(x * y + z)) * np.sin(x + 2 * z),
+        limits=[(0.0, 1.0), (0.0, lambda x: x), (0.0, lambda x, y: x + y)]),
+}
+MULTI_TOLERANCES = (1e-6, 1e-10)
+
+# Число значений t в тесте на перебор параметра и число точек, на которых замеряется quad
+SWEEP_SIZE = 100000
+SWEEP_QUAD_SAMPLE = 1000
+
+
+# Время одного вызова (лучшее из repeat) и результат
+def _timed(function, repeat: int = 5) -> tuple[float, object]:
+    result = function()
+    return min(timeit.repeat(function, number=1, repeat=repeat)), result
+
+
+# scipy.integrate.quad по одному значению параметров (как в ex-1.py), нижний предел 0 без сдвига
+def _quad(f, a, b, args=()):
+    if not args:
+        return integrate.quad(f, a, b, limit=200)[0]
+    return np.array([integrate.quad(f, a, b, args=tuple(values), limit=200)[0]
+                     for values in zip(*np.broadcast_arrays(*args))])
+
+
+def run_cases() -> list[list]:
+    rows = []
+    for name, case in CASES.items():
+        f, a, b, args, exact = case['f'], case['a'], case['b'], case.get('args', ()), case['exact']
+        methods = {
+            'quad (scipy)': lambda: _quad(f, a, b, args),
+            'gauss-kronrod': lambda: gauss_kronrod(f, a, b, args)[0],
+            'tanh-sinh': lambda: tanh_sinh(f, a, b, args)[0],
+        }
+        if 'laguerre' in case:
+            methods['gauss-laguerre'] = lambda: gauss_laguerre(case['laguerre'], args)
+        if 'hermite' in case:
+            methods['gauss-hermite'] = lambda: gauss_hermite(case['hermite'], args)
+        for method, function in methods.items():
+            with np.errstate(all='ignore'):
+                elapsed, result = _timed(function)
+            rows.append([name, method, np.max(np.abs(np.asarray(result) - exact)), elapsed * 1e3])
+    return rows
+
+
+# scipy.integrate.dblquad/tplquad: аргументы f в обратном порядке (внутренняя переменная первая)
+def _nquad(f, limits, tol: float = 1.49e-8):
+    reverse = lambda *x: f(*x[::-1])
+    (a, b), *inner = limits
+    if len(limits) == 2:
+        return integrate.dblquad(reverse, a, b, *inner[0], epsabs=tol, epsrel=tol)[0]
+    return integrate.tplquad(reverse, a, b, *inner[0], *inner[1], epsabs=tol, epsrel=tol)[0]
+
+
+def run_multi_cases() -> list[list]:
+    rows = []
+    for name, case in MULTI_CASES.items():
+        f, limits = case['f'], case['limits']
+        exact = case['exact'] if 'exact' in case else _nquad(f, limits, 1e-14)
+        for tol in MULTI_TOLERANCES:
+            for method, function in {
+                'dblquad/tplquad (scipy)': lambda: _nquad(f, limits, tol),
+                'cubature': lambda: cubature(f, limits, tol=tol)[0],
+            }.items():
+                elapsed, result = _timed(function)
+                rows.append([name, method, tol, np.max(np.abs(np.asarray(result) - exact)), elapsed * 1e3])
+    return rows
+
+
+# Интеграл 5 с множителем y^p для SWEEP_QUAD_SAMPLE значений p: точное значение - через одномерный интеграл
+def run_multi_sweep() -> list[list]:
+    case = MULTI_CASES['5. x y^2, 2 - y <= x <= sqrt(4 - y^2)']
+    p = np.linspace(0, 3, SWEEP_QUAD_SAMPLE)
+    f = lambda y, x, p: x * np.pow(y, p)
+    # int x dx по [2 - y, sqrt(4 - y^2)] = (4 - y^2 - (2 - y)^2) / 2 = 2y - y^2
+    exact = gauss_kronrod(lambda y, p: (2 * y - y * y) * np.pow(y, p), 0.0, 2.0, (p,))[0]
+    rows = []
+    elapsed, result = _timed(lambda: np.array([_nquad(lambda y, x: f(y, x, p_i), case['limits']) for p_i in p]), repeat=1)
+    rows.append(['dblquad (scipy)', np.max(np.abs(result - exact)), elapsed])
+    elapsed, result = _timed(lambda: cubature(f, case['limits'], args=(p,))[0], repeat=3)
+    rows.append(['cubature', np.max(np.abs(result - exact)), elapsed])
+    return rows
+
+
+# I(t) = ln t для SWEEP_SIZE значений t: quad замеряется на выборке и пересчитывается на весь набор
+def run_sweep() -> list[list]:
+    case = CASES['2. (exp(-x) - exp(-t x)) / x, t = 1..3']
+    t = np.linspace(0.5, 5, SWEEP_SIZE)
+    rows = []
+    sample = t[::SWEEP_SIZE // SWEEP_QUAD_SAMPLE]
+    with np.errstate(all='ignore'):
+        elapsed, result = _timed(lambda: _quad(case['f'], 0.0, np.inf, (sample,)), repeat=1)
+    rows.append(['quad (scipy), оценка', np.max(np.abs(result - np.log(sample))), elapsed * SWEEP_SIZE / len(sample)])
+    for method, function in {
+        'gauss-kronrod': lambda: gauss_kronrod(case['f'], 0.0, np.inf, (t,))[0],
+        'tanh-sinh': lambda: tanh_sinh(case['f'], 0.0, np.inf, (t,))[0],
+        'gauss-laguerre': lambda: gauss_laguerre(case['laguerre'], (t,)),
+    }.items():
+        elapsed, result = _timed(function, repeat=3)
+        rows.append([method, np.max(np.abs(result - np.log(t))), elapsed])
+    return rows
+
+
+if __name__ == "__main__":
+    print(tabulate(run_cases(), headers=['Интеграл', 'Метод', 'Ошибка', 'Время, мс'], tablefmt='grid', floatfmt=('', '', '.2e', '.3f')))
+    print(tabulate(run_multi_cases(), headers=['Интеграл', 'Метод', 'Допуск', 'Ошибка', 'Время, мс'], tablefmt='grid', floatfmt=('', '', '.0e', '.2e', '.3f')))
+    print(f"\nИнтеграл 5 с y^p для {SWEEP_QUAD_SAMPLE} значений p:")
+    print(tabulate(run_multi_sweep(), headers=['Метод', 'Ошибка', 'Время, с'], tablefmt='grid', floatfmt=('', '.2e', '.3f')))
+    print(f"\nI(t) = ln t для {SWEEP_SIZE} значений t:")
+    print(tabulate(run_sweep(), headers=['Метод', 'Ошибка', 'Время, с'], tablefmt='grid', floatfmt=('', '.2e', '.3f')))
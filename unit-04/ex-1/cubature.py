@@ -0,0 +1,95 @@
+from itertools import product
+import numpy as np
+
+from quadrature import GAUSS_WEIGHTS, KRONROD_NODES, KRONROD_WEIGHTS, TOLERANCE
+
+# Кубатура по областям с переменными пределами:
+#   x0 в [a0, b0], x1 в [a1(x0), b1(x0)], x2 в [a2(x0, x1), b2(x0, x1)], ...
+# Область отображается на единичный куб (x_k = a_k + (b_k - a_k) u_k, якобиан - произведение длин),
+# куб делится на ячейки, в каждой применяется тензорное произведение правил Гаусса-Кронрода 7-15.
+# Подынтегральная функция f(x0, x1, ..., *args) вызывается один раз на массиве всех узлов всех ячеек
+
+# Узлы и веса на [0, 1]
+_NODES = (1 + KRONROD_NODES) / 2
+_KRONROD = KRONROD_WEIGHTS / 2
+_GAUSS = GAUSS_WEIGHTS / 2
+
+
+# Тензорная сетка узлов (n^d x d), веса Кронрода и Гаусса (n^d) и веса разностей по осям (d x n^d):
+# строка k - правило Кронрода по всем осям, кроме k, и разность Кронрод - Гаусс по оси k.
+# Эти разности показывают, вдоль какой оси погрешность ячейки больше всего
+def _tensor_rule(dimension: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    nodes = np.array(list(product(_NODES, repeat=dimension)))
+    kronrod = np.prod(np.array(list(product(_KRONROD, repeat=dimension))), axis=1)
+    gauss = np.prod(np.array(list(product(_GAUSS, repeat=dimension))), axis=1)
+    axes = np.array([
+        np.prod(np.array(list(product(*(_KRONROD - _GAUSS if j == k else _KRONROD for j in range(dimension))))), axis=1)
+        for k in range(dimension)
+    ])
+    return nodes, kronrod, gauss, axes
+
+
+def _limit(value, outer: list[np.ndarray]):
+    return value(*outer) if callable(value) else value
+
+
+# Значения f * якобиан в точках u единичного куба (..., d)
+def _mapped(f, limits, u: np.ndarray, args: list[np.ndarray], shape: tuple[int, ...]) -> np.ndarray:
+    pad = (1,) * len(shape)
+    x, jacobian = [], 1.0
+    for k, (lower, upper) in enumerate(limits):
+        lower, upper = _limit(lower, x), _limit(upper, x)
+        x.append(lower + (upper - lower) * u[..., k].reshape(u.shape[:-1] + pad))
+        jacobian = jacobian * (upper - lower)
+    return np.broadcast_to(f(*x, *args) * jacobian, u.shape[:-1] + shape)
+
+
+# Интеграл по области limits = [(a0, b0), (a1, b1), ...], пределы - числа или функции внешних переменных.
+# Возвращает значение и оценку погрешности |K - G| (форма параметров args).
+# При adaptive=True ячейки с наибольшей погрешностью делятся пополам вдоль оси с наибольшей разностью
+# правил (для особенности вдоль одной оси другие оси не измельчаются), пока сумма
+# оценок не станет меньше tol * max(1, |I|) или число ячеек не превысит max_cells
+def cubature(f, limits: list[tuple], args=(), tol: float = TOLERANCE, initial: int = 1,
+             adaptive: bool = True, max_cells: int = 4096) -> tuple[np.ndarray, np.ndarray]:
+    dimension = len(limits)
+    args = [np.asarray(arg, dtype=float) for arg in args]
+    shape = np.broadcast_shapes(*(arg.shape for arg in args)) if args else ()
+    nodes, kronrod_weights, gauss_weights, axis_weights = _tensor_rule(dimension)
+
+    edges = np.linspace(0, 1, initial + 1)
+    lo = np.array(list(product(edges[:-1], repeat=dimension)))
+    width = np.full_like(lo, 1 / initial)
+    starts, widths = np.empty((0, dimension)), np.empty((0, dimension))
+    values, errors = np.empty((0,) + shape), np.empty((0,) + shape)
+    directions = np.empty(0, dtype=int)
+
+    while True:
+        u = lo[:, np.newaxis, :] + width[:, np.newaxis, :] * nodes
+        y = _mapped(f, limits, u, args, shape)
+        volume = np.prod(width, axis=1).reshape((len(lo),) + (1,) * len(shape))
+        kronrod = volume * np.tensordot(kronrod_weights, y, axes=(0, 1))
+        gauss = volume * np.tensordot(gauss_weights, y, axes=(0, 1))
+        starts, widths = np.concatenate([starts, lo]), np.concatenate([widths, width])
+        values = np.concatenate([values, kronrod])
+        errors = np.concatenate([errors, np.abs(kronrod - gauss)])
+        spread = np.abs(np.tensordot(axis_weights, y, axes=(1, 1))).reshape(dimension, len(lo), -1).max(axis=2)
+        directions = np.concatenate([directions, np.argmax(spread, axis=0)])
+
+        total, error = values.sum(axis=0), errors.sum(axis=0)
+        target = tol * np.maximum(1.0, np.abs(total))
+        if not adaptive or np.all(error <= target) or len(starts) >= max_cells:
+            return total, error
+
+        worst = errors.reshape(len(errors), -1).max(axis=1)
+        split = worst > np.min(target) / len(starts)
+        if not np.any(split):
+            split = worst >= worst.max()
+        rows = np.arange(np.count_nonzero(split))
+        lo, width = starts[split], widths[split].copy()
+        width[rows, directions[split]] /= 2
+        upper = lo.copy()
+        upper[rows, directions[split]] += width[rows, directions[split]]
+        lo, width = np.concatenate([lo, upper]), np.concatenate([width, width])
+        keep = ~split
+        starts, widths, values, errors, directions = (
+            starts[keep], widths[keep], values[keep], errors[keep], directions[keep])
@@ -1,5 +1,7 @@
 from scipy import integrate
 import numpy as np    
+from quadrature import tanh_sinh
+from cubature import cubature
 
 def integral_1():
     func = lambda x: 1.0 / (x * np.sqrt(1 + np.log(x)))
@@ -12,20 +14,22 @@ def integral_1():
 
 def integral_2():
     func = lambda x, t: (np.exp(-x) - np.exp(-t * x)) / x
-    a = 1e-10
+    a = 0
     b = np.inf
     ts = np.linspace(1, 3, 3)
     true_vals = np.log(ts)
-    results = [integrate.quad(func, a, b, args=(t,))[0] for t in ts]
+    # Все значения t считаются одним векторизованным вызовом, нижний предел 0 без сдвига
+    results, _ = tanh_sinh(func, a, b, args=(ts,))
     errors = np.abs(results - true_vals)
     print(f"==========\n2. Results = {results}, errors = {errors}")
 
 def integral_3():
     func = lambda x: np.pow(x, 1 / np.pi) / x / (1 + x)
-    a = 1e-10
+    a = 0
     b = np.inf
     true_val = np.pi / np.sin(1)
-    result, _ = integrate.quad(func, a, b)
+    # Особенность x^(1/pi - 1) в нуле интегрируется заменой переменной exp-sinh
+    result, _ = tanh_sinh(func, a, b)
     error = np.abs(result - true_val)
     print(f"==========\n3. Result = {result}, error = {error}")
 
@@ -39,13 +43,14 @@ def integral_4():
     print(f"==========\n4. Result = {result}, error = {error}")
 
 def integral_5():
-    func = lambda x, y: x * np.pow(y, 2)
+    # Внешняя переменная y в [0, 2], внутренняя x в [2 - y, sqrt(4 - y^2)]
+    func = lambda y, x: x * np.pow(y, 2)
     a1 = 0
     b1 = 2
     a2 = lambda y: 2 - y
     b2 = lambda y: np.sqrt(4 - np.pow(y, 2))
     true_val = 8 / 5
-    result, _ = integrate.dblquad(func, a1, b1, a2, b2)
+    result, _ = cubature(func, [(a1, b1), (a2, b2)])
     error = np.abs(result - true_val)
     print(f"==========\n5. Result = {result}, error = {error}")
 
@@ -0,0 +1,115 @@
+from functools import lru_cache
+import numpy as np
+
+# Функция Дебая табулируется по y = theta_D / T на отрезке [Y_MIN, Y_MAX].
+# Ниже Y_MIN используется ряд Тейлора, выше Y_MAX - асимптотика (низкие температуры)
+Y_MIN = 0.1
+Y_MAX = 35.0
+TABLE_SIZE = 4096
+
+# Универсальная газовая постоянная N_A * k_B, Дж/(моль K) (как scipy.constants.R)
+R = 6.02214076e23 * 1.380649e-23
+
+# J(inf) = pi^4 / 15
+J_INF = np.pi ** 4 / 15
+
+
+# Подынтегральная функция x^3 / (e^x - 1) без переполнения при больших x
+def _integrand(x: np.ndarray) -> np.ndarray:
+    return np.pow(x, 3) * np.exp(-x) / -np.expm1(-x)
+
+
+# Ряд Тейлора для J(y) = int_0^y x^3 / (e^x - 1) dx при малых y (высокие температуры)
+def _series(y: np.ndarray) -> np.ndarray:
+    return np.pow(y, 3) * (1 / 3 - y / 8 + np.pow(y, 2) / 60 - np.pow(y, 4) / 5040 + np.pow(y, 6) / 272160)
+
+
+# Асимптотика для больших y (низкие температуры): J(inf) минус хвост интеграла
+def _asymptotic(y: np.ndarray) -> np.ndarray:
+    tail = sum(np.exp(-k * y) * (np.pow(y, 3) / k + 3 * np.pow(y, 2) / k ** 2 + 6 * y / k ** 3 + 6 / k ** 4)
+               for k in (1, 2, 3))
+    return J_INF - tail
+
+
+# Таблица строится один раз: узлы, значения D3(y) = 3 J(y) / y^3 и производные D3'(y).
+# Интерполируется гладкая D3, а не J, чтобы относительная точность не падала при малых y.
+# Интеграл на каждом отрезке считается квадратурой Гаусса-Лежандра
+@lru_cache(maxsize=None)
+def _table(size: int = TABLE_SIZE) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    y = np.linspace(Y_MIN, Y_MAX, size)
+    nodes, weights = np.polynomial.legendre.leggauss(12)
+    middle = (y[1:] + y[:-1]) / 2
+    half = (y[1:] - y[:-1]) / 2
+    x = middle[:, np.newaxis] + half[:, np.newaxis] * nodes
+    pieces = half * (_integrand(x) @ weights)
+    J = np.concatenate(([_series(Y_MIN)], _series(Y_MIN) + np.cumsum(pieces)))
+    D = 3 * J / np.pow(y, 3)
+    dD = 3 * _integrand(y) / np.pow(y, 3) - 3 * D / y
+    return y, D, dD
+
+
+# Функция Дебая D3(y) = 3 / y^3 * J(y) для массива y: кубическая эрмитова интерполяция по таблице.
+# y = inf (T = 0) исключается из поиска по таблице, предел D3(inf) = 0
+def debye_function(y) -> np.ndarray:
+    y = np.asarray(y, dtype=float)
+    zero = np.isinf(y)
+    y = np.where(zero, Y_MAX, y)
+    nodes, D, dD = _table()
+    h = nodes[1] - nodes[0]
+    i = np.clip(((y - Y_MIN) / h).astype(int), 0, len(nodes) - 2)
+    t = (y - nodes[i]) / h
+    t2, t3 = t * t, t * t * t
+    result = ((2 * t3 - 3 * t2 + 1) * D[i] + (t3 - 2 * t2 + t) * h * dD[i]
+              + (-2 * t3 + 3 * t2) * D[i + 1] + (t3 - t2) * h * dD[i + 1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(y < Y_MIN, 3 * _series(y) / np.pow(y, 3), result)
+        result = np.where(y > Y_MAX, 3 * _asymptotic(y) / np.pow(y, 3), result)
+    return np.where(zero, 0.0, result)
+
+
+# Интеграл J(y) = int_0^y x^3 / (e^x - 1) dx, J(inf) = pi^4 / 15
+def debye_integral(y) -> np.ndarray:
+    y = np.asarray(y, dtype=float)
+    with np.errstate(invalid='ignore'):
+        return np.where(np.isinf(y), J_INF, np.pow(y, 3) * debye_function(y) / 3)
+
+
+# y = theta_D / T. Для массива theta_D (несколько материалов) результат имеет форму (материалы x температуры).
+# Возвращаются T, theta_D и y одной формы; при T = 0 y = inf
+def _reduced(T, theta_D) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    T = np.asarray(T, dtype=float)
+    theta_D = np.asarray(theta_D, dtype=float)
+    with np.errstate(divide='ignore'):
+        y = np.divide.outer(theta_D, T)
+    return np.broadcast_to(T, y.shape), np.broadcast_to(theta_D.reshape(theta_D.shape + (1,) * T.ndim), y.shape), y
+
+
+# Слагаемое y / (e^y - 1) с пределом 0 при y = inf
+def _bose(y: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid='ignore'):
+        return np.where(np.isinf(y), 0.0, y * np.exp(-y) / -np.expm1(-y))
+
+
+# Теплоемкость C_V = 3 N k_B [4 D3(y) - 3y / (e^y - 1)]. Nk_B - произведение числа частиц на k_B,
+# по умолчанию R, то есть результат в Дж/(моль K)
+def heat_capacity(T, theta_D, Nk_B: float = R) -> np.ndarray:
+    _, _, y = _reduced(T, theta_D)
+    return 3 * Nk_B * (4 * debye_function(y) - 3 * _bose(y))
+
+
+# Внутренняя энергия с учетом нулевых колебаний: U = 9/8 N k_B theta_D + 3 N k_B T D3(y)
+def internal_energy(T, theta_D, Nk_B: float = R) -> np.ndarray:
+    T, theta_D, y = _reduced(T, theta_D)
+    return Nk_B * (9 / 8 * theta_D + 3 * T * debye_function(y))
+
+
+# Энтропия S = N k_B [4 D3(y) - 3 ln(1 - e^-y)]
+def entropy(T, theta_D, Nk_B: float = R) -> np.ndarray:
+    _, _, y = _reduced(T, theta_D)
+    return Nk_B * (4 * debye_function(y) - 3 * np.log(-np.expm1(-y)))
+
+
+# Свободная энергия Гельмгольца F = U - T S
+def free_energy(T, theta_D, Nk_B: float = R) -> np.ndarray:
+    T, theta_D, y = _reduced(T, theta_D)
+    return Nk_B * (9 / 8 * theta_D + T * (3 * np.log(-np.expm1(-y)) - debye_function(y)))
@@ -1,16 +1,14 @@
-from scipy import integrate
 import numpy as np
 import matplotlib.pyplot as plt
+from debye import heat_capacity
 
 def model(V: float,
          rho: float,
          k_B: float,
          T: np.array,
          theta_D: float):
-    const = 9 * V * rho * k_B / np.pow(theta_D, 3)
-    integral_func = lambda x: np.pow(x, 4) * np.exp(x) / np.pow(np.exp(x) - 1, 2)
-    model_func = lambda T_i: const * np.pow(T_i, 3) * integrate.quad(integral_func, 1e-10, theta_D / T_i)[0]
-    return [model_func(T_i) for T_i in T]
+    # Функция Дебая берется из заранее построенной таблицы, весь массив T считается сразу
+    return heat_capacity(T, theta_D, V * rho * k_B)
 
 def save_plot(T, C_V):
     plt.figure()
@@ -0,0 +1,97 @@
+from functools import lru_cache
+import re
+import sys
+import time
+
+import numpy as np
+from species import DEFAULT_FILEPATH, get_registry, normalize_formula
+
+# Символы элементов: опечатка в названии вещества не должна разбираться как формула
+ELEMENTS = frozenset('''
+    H He Li Be B C N O F Ne Na Mg Al Si P S Cl Ar K Ca Sc Ti V Cr Mn Fe Co Ni Cu Zn Ga Ge As Se Br Kr
+    Rb Sr Y Zr Nb Mo Tc Ru Rh Pd Ag Cd In Sn Sb Te I Xe Cs Ba La Ce Pr Nd Pm Sm Eu Gd Tb Dy Ho Er Tm Yb
+    Lu Hf Ta W Re Os Ir Pt Au Hg Tl Pb Bi Po At Rn Fr Ra Ac Th Pa U Np Pu D
+'''.split())
+
+# Элемент, группа в скобках или закрывающая скобка, за которыми может идти число атомов
+TOKEN = re.compile(r'([A-Z][a-z]?|\(|\))(\d*)')
+
+
+# Состав по формуле: '$C_4H_{10}$' -> {'C': 4, 'H': 10}, 'CH3(CH2)2OH' -> {'C': 3, 'H': 8, 'O': 1}.
+# Разбор кэшируется, результат нельзя изменять
+@lru_cache(maxsize=None)
+def parse_formula(notation: str) -> dict[str, int]:
+    formula = normalize_formula(notation)
+    stack = [{}]
+    position = 0
+    for match in TOKEN.finditer(formula):
+        token, count = match.group(1), int(match.group(2) or 1)
+        if match.start() != position or (token == '(' and match.group(2)) or (token == ')' and len(stack) == 1) \
+                or token not in ELEMENTS and token not in '()':
+            break
+        position = match.end()
+        if token == '(':
+            stack.append({})
+        elif token == ')':
+            group = stack.pop()
+            for element, number in group.items():
+                stack[-1][element] = stack[-1].get(element, 0) + number * count
+        else:
+            stack[-1][token] = stack[-1].get(token, 0) + count
+    if position != len(formula) or len(stack) != 1 or not formula:
+        raise ValueError(f'Неверная формула: {notation}')
+    return stack[0]
+
+
+# Состав вещества из реестра (по названию или формуле); если вещества нет в таблице, разбирается сама строка
+def species_composition(key: str, filepath: str = DEFAULT_FILEPATH) -> dict[str, int]:
+    registry = get_registry(filepath)
+    return parse_formula(registry[key].Formula if key in registry else key)
+
+
+# Порядок Хилла: C, H, затем остальные элементы по алфавиту (без углерода - все по алфавиту)
+def hill_order(elements) -> list[str]:
+    elements = set(elements)
+    if 'C' not in elements:
+        return sorted(elements)
+    return ['C'] + (['H'] if 'H' in elements else []) + sorted(elements - {'C', 'H'})
+
+
+# Матрица баланса элементов Aeq (элементы x вещества) для списка веществ.
+# sparse=True возвращает scipy.sparse.csr_array (scipy импортируется только в этом случае)
+def element_matrix(species: list[str], filepath: str = DEFAULT_FILEPATH,
+                   sparse: bool = False) -> tuple[list[str], np.ndarray]:
+    compositions = [species_composition(name, filepath) for name in species]
+    elements = hill_order(element for composition in compositions for element in composition)
+    index = {element: i for i, element in enumerate(elements)}
+    rows = [index[element] for composition in compositions for element in composition]
+    columns = [j for j, composition in enumerate(compositions) for _ in composition]
+    values = [number for composition in compositions for number in composition.values()]
+    if sparse:
+        from scipy import sparse as sp
+        return elements, sp.csr_array((values, (rows, columns)), shape=(len(elements), len(species)), dtype=float)
+    Aeq = np.zeros((len(elements), len(species)))
+    Aeq[rows, columns] = values
+    return elements, Aeq
+
+
+# Aeq и вектор beq = Aeq @ feed (количество атомов каждого элемента в исходной смеси)
+def element_balance(species: list[str], feed, filepath: str = DEFAULT_FILEPATH,
+                    sparse: bool = False) -> tuple[list[str], np.ndarray, np.ndarray]:
+    elements, Aeq = element_matrix(species, filepath, sparse)
+    return elements, Aeq, Aeq @ np.asarray(feed, dtype=float)
+
+
+if __name__ == "__main__":
+    for notation in ('$H_2O$', 'CH4', '$C_4H_{10}$', 'CH3(CH2)2OH', 'Ca(OH)2'):
+        print(f"{notation}: {parse_formula(notation)}")
+    species = sys.argv[1:] or ['Methane', 'Water', 'Carbon Monoxide', 'Hydrogen']
+    elements, Aeq = element_matrix(species)
+    print(elements)
+    print(Aeq)
+
+    registry = get_registry()
+    species = [record.Name for record in registry] * 1000
+    start = time.perf_counter()
+    elements, Aeq = element_matrix(species, sparse=True)
+    print(f"Aeq для {len(species)} веществ: {Aeq.shape}, {time.perf_counter() - start:.4f} s")
@@ -0,0 +1,173 @@
+from collections import OrderedDict
+from functools import lru_cache
+from typing import NamedTuple
+import os
+import threading
+import time
+
+import numpy as np
+from species import DEFAULT_FILEPATH, get_registry
+from thermodynamic import PiecewiseCp, check_range, piecewise, piecewise_properties, piecewise_tables, piecewise_values
+
+# Число записей в кэше по умолчанию (запись - массив G° одного вещества или реакции на одной сетке T)
+CACHE_SIZE = 4096
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+# LRU-кэш стандартных энергий Гиббса G°(T) веществ и dG°(T) реакций, кДж/моль.
+# Ключ - вещество (или стехиометрия реакции) и значения температур, поэтому повторные расчеты
+# на той же сетке T (перебор составов, давлений) берут значения из кэша.
+# Если коэффициенты вещества в реестре изменились, его записи и записи реакций с ним сбрасываются.
+# Диапазон температур проверяется при каждом запросе, в том числе при попадании в кэш (on_range - как в thermodynamic)
+class GibbsCache:
+    def __init__(self, filepath: str = DEFAULT_FILEPATH, maxsize: int = CACHE_SIZE):
+        self.filepath = filepath
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._records = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    # Ключ сетки температур: байты непрерывного массива float64, чтобы одинаковые значения
+    # (срез, другой тип или порядок байтов) давали один ключ
+    @staticmethod
+    def _key_T(T: np.ndarray) -> bytes:
+        return np.ascontiguousarray(T, dtype=np.float64).tobytes()
+
+    def _get(self, key):
+        value = self._entries.get(key)
+        if value is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def _put(self, key, value: np.ndarray):
+        value.setflags(write=False)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    # Сверка коэффициентов (всех участков) с реестром: при изменении записей вещества кэш по нему сбрасывается
+    def _check(self, names: list[str]) -> list[PiecewiseCp]:
+        registry = get_registry(self.filepath)
+        tables = []
+        for name in names:
+            segments = registry.segments(name)
+            if self._records.get(segments[0].Name, segments) != segments:
+                self._invalidate(segments[0].Name)
+            self._records[segments[0].Name] = segments
+            tables.append(piecewise(segments))
+        return tables
+
+    # G°(T) веществ из кэша, недостающие считаются одной матричной операцией (под блокировкой)
+    def _species(self, tables: list[PiecewiseCp], T: np.ndarray, on_range: str) -> np.ndarray:
+        key_T = self._key_T(T)
+        result = np.empty((len(tables), len(T)))
+        missing = []
+        for i, table in enumerate(tables):
+            value = self._get(('species', table.Name, key_T, on_range))
+            if value is None:
+                missing.append(i)
+            else:
+                result[i] = value
+        if missing:
+            _, _, G, inside = piecewise_values([tables[i] for i in missing], T)
+            if on_range == 'nan':
+                G = np.where(inside, G, np.nan)
+            for i, G_i in zip(missing, G):
+                result[i] = G_i
+                self._put(('species', tables[i].Name, key_T, on_range), G_i.copy())
+        return result
+
+    # G°(T) веществ (species x T)
+    def species(self, names: list[str], T, on_range: str = 'raise') -> np.ndarray:
+        T = np.atleast_1d(np.asarray(T, dtype=float))
+        with self._lock:
+            tables = self._check(names)
+        check_range(tables, np.array([table.in_range(T) for table in tables]), T, on_range)
+        with self._lock:
+            return self._species(tables, T, on_range)
+
+    # dG°(T) реакции по стехиометрии {вещество: коэффициент} (отрицательные - исходные вещества)
+    def reaction(self, stoichiometry: dict[str, float], T, on_range: str = 'raise') -> np.ndarray:
+        T = np.atleast_1d(np.asarray(T, dtype=float))
+        with self._lock:
+            tables = self._check(list(stoichiometry))
+        check_range(tables, np.array([table.in_range(T) for table in tables]), T, on_range)
+        with self._lock:
+            key = ('reaction', tuple(sorted((table.Name, float(nu)) for table, nu in zip(tables, stoichiometry.values()))),
+                   self._key_T(T), on_range)
+            value = self._get(key)
+            if value is None:
+                nu = np.array(list(stoichiometry.values()), dtype=float)
+                value = nu @ self._species(tables, T, on_range)
+                self._put(key, value.copy())
+            return value.copy()
+
+    def _invalidate(self, name: str):
+        for key in [key for key in self._entries
+                    if (key[0] == 'species' and key[1] == name)
+                    or (key[0] == 'reaction' and any(species == name for species, _ in key[1]))]:
+            del self._entries[key]
+        self._records.pop(name, None)
+
+    # Сброс записей вещества (и реакций с ним) или всего кэша, например после изменения коэффициентов
+    def invalidate(self, name: str | None = None):
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                self._records.clear()
+            else:
+                self._invalidate(get_registry(self.filepath)[name].Name)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._records.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+@lru_cache(maxsize=None)
+def _load_cache(filepath: str) -> GibbsCache:
+    return GibbsCache(filepath)
+
+
+# Общий для процесса кэш на каждый файл с данными
+def get_gibbs_cache(filepath: str = DEFAULT_FILEPATH) -> GibbsCache:
+    return _load_cache(os.path.abspath(filepath))
+
+
+if __name__ == "__main__":
+    cache = get_gibbs_cache()
+    names = ['Hydrogen', 'Oxygen', 'Water', 'Methane', 'Carbon Monoxide', 'Carbon Dioxide']
+    T = np.linspace(300, 700, 50)
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        cache.species(names, T)
+    print(f"1000 запросов G°: {time.perf_counter() - start:.4f} s, {cache.info()}")
+
+    dG = cache.reaction({'Hydrogen': -2, 'Oxygen': -1, 'Water': 2}, T)
+    _, _, G = piecewise_properties(piecewise_tables(names), T)
+    print(f"dG°(300 K) = {dG[0]:.3f} кДж/моль, отклонение G°: {np.max(np.abs(cache.species(names, T) - G)):.2e}")
+    cache.invalidate('Water')
+    print(f"После сброса Water: {cache.info()}")
+    try:
+        cache.species(names, np.linspace(300, 1500, 50))
+    except ValueError as error:
+        print(error)
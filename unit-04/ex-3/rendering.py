@@ -0,0 +1,187 @@
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+import matplotlib
+
+# Отрисовка отчетных графиков без интерактивного окна: фигура создается напрямую (без pyplot и его
+# глобального состояния) и сохраняется через Agg. Все серии панели рисуются одной LineCollection,
+# плотные кривые перед отрисовкой прореживаются, множество фигур можно строить в пуле процессов
+
+# Наибольшее число точек кривой после прореживания (в пикселях ширины графика их все равно меньше)
+MAX_POINTS = 2000
+
+# Поля фигуры в дюймах: left, right, bottom, top, промежуток между панелями и место под общий заголовок.
+# Постоянные поля вместо tight_layout: подбор полей по размерам подписей удваивал время отрисовки
+MARGINS = dict(left=0.8, right=0.2, bottom=0.6, top=0.4, space=0.8, title=0.35)
+
+# Уровень сжатия PNG: 1 - быстрее по умолчанию (6) в несколько раз при файле на десятки процентов больше
+COMPRESS_LEVEL = 1
+
+COLORS = matplotlib.rcParams['axes.prop_cycle'].by_key()['color']
+
+
+# Прореживание min-max: ряд делится на max_points / 2 корзин, в каждой остаются минимум и максимум
+# (в исходном порядке), а также крайние точки. Форма кривой и ее экстремумы на графике не меняются.
+# x - (N) или (серии x N), y - (серии x N); возвращаются массивы (серии x M)
+def decimate(x, y, max_points: int = MAX_POINTS) -> tuple[np.ndarray, np.ndarray]:
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    x = np.broadcast_to(np.asarray(x, dtype=float), y.shape)
+    series, n = y.shape
+    if n <= max_points:
+        return x, y
+    buckets = max(max_points // 2 - 1, 1)
+    size = -(-n // buckets)
+    padded = np.pad(y, ((0, 0), (0, buckets * size - n)), mode='edge').reshape(series, buckets, size)
+    offset = np.arange(buckets)[np.newaxis, :] * size
+    # NaN (разрывы кривой) не участвуют в выборе экстремумов; в корзине только из NaN выбирается ее первая
+    # точка, и разрыв на графике сохраняется
+    missing = np.isnan(padded)
+    low = np.minimum(np.argmin(np.where(missing, np.inf, padded), axis=2) + offset, n - 1)
+    high = np.minimum(np.argmax(np.where(missing, -np.inf, padded), axis=2) + offset, n - 1)
+    edges = np.broadcast_to(np.array([0, n - 1]), (series, 2))
+    index = np.sort(np.concatenate([edges, low, high], axis=1), axis=1)
+    return np.take_along_axis(x, index, axis=1), np.take_along_axis(y, index, axis=1)
+
+
+# Панель графика: линии (x, y) и точки (points_x, points_y) для серий с подписями labels.
+# x - (N) или (серии x N), y - (серии x N); точки - списки массивов по сериям (могут быть разной длины)
+@dataclass
+class Panel:
+    x: np.ndarray
+    y: np.ndarray
+    labels: list[str]
+    title: str = ''
+    xlabel: str = 'T, K'
+    ylabel: str = ''
+    points_x: list[np.ndarray] | None = None
+    points_y: list[np.ndarray] | None = None
+    legend: dict = field(default_factory=dict)
+    grid: bool = False
+
+
+# Фигура отчета: панели в один ряд, путь к PNG и размер в дюймах.
+# margins дополняет MARGINS (например, шире правое поле под легенду снаружи панели)
+@dataclass
+class FigureSpec:
+    panels: list[Panel]
+    path: str
+    size: tuple[float, float] = (6.0, 4.0)
+    title: str = ''
+    dpi: int = 100
+    margins: dict = field(default_factory=dict)
+
+
+# Положение легенды с наименьшим числом точек кривых под ней. Размещение 'best' у matplotlib не учитывает
+# линии LineCollection, поэтому угол выбирается по данным: кривые передискретизируются (чтобы отрезок между
+# редкими узлами тоже учитывался) и переводятся в доли осей; размер легенды оценивается по длине и числу подписей
+def _legend_location(ax, x: np.ndarray, y: np.ndarray, labels: list[str], samples: int = 200) -> str:
+    position = np.linspace(0, x.shape[1] - 1, samples)
+    index = np.arange(x.shape[1])
+    x = np.concatenate([np.interp(position, index, row) for row in x])
+    y = np.concatenate([np.interp(position, index, row) for row in y])
+    (x0, x1), (y0, y1) = ax.get_xlim(), ax.get_ylim()
+    u, v = (x - x0) / (x1 - x0), (y - y0) / (y1 - y0)
+    # Оценка размера легенды в дюймах: знак ~0.6 кегля, линия-маркер и отступы ~4 кегля, строка ~1.4 кегля
+    size = matplotlib.rcParams['font.size'] / 72
+    box = ax.get_position()
+    figure_width, figure_height = ax.figure.get_size_inches()
+    width = min((0.6 * max(map(len, labels), default=0) + 4) * size / (box.width * figure_width), 1.0)
+    height = min((1.4 * len(labels) + 0.8) * size / (box.height * figure_height), 1.0)
+    # Границы легенды по каждой оси для положений left/center/right и upper/center/lower
+    columns = {'left': (0.0, width), 'center': (0.5 - width / 2, 0.5 + width / 2), 'right': (1 - width, 1.0)}
+    rows = {'upper': (1 - height, 1.0), 'center': (0.5 - height / 2, 0.5 + height / 2), 'lower': (0.0, height)}
+    corners = {}
+    # Порядок предпочтения как у matplotlib: углы, затем середины сторон и центр
+    for row, column in (('upper', 'right'), ('upper', 'left'), ('lower', 'left'), ('lower', 'right'),
+                        ('center', 'left'), ('center', 'right'), ('lower', 'center'), ('upper', 'center'),
+                        ('center', 'center')):
+        (u0, u1), (v0, v1) = columns[column], rows[row]
+        name = 'center' if row == column else f'{row} {column}'
+        corners[name] = (u >= u0) & (u <= u1) & (v >= v0) & (v <= v1)
+    return min(corners, key=lambda corner: np.count_nonzero(corners[corner]))
+
+
+def _draw_panel(ax, panel: Panel, max_points: int):
+    x, y = decimate(panel.x, panel.y, max_points)
+    colors = [COLORS[i % len(COLORS)] for i in range(len(y))]
+    ax.add_collection(LineCollection(np.stack([x, y], axis=-1), colors=colors))
+    if panel.points_x is not None:
+        px = np.concatenate([np.asarray(points, dtype=float) for points in panel.points_x])
+        py = np.concatenate([np.asarray(points, dtype=float) for points in panel.points_y])
+        point_colors = [color for color, points in zip(colors, panel.points_x) for _ in range(len(points))]
+        ax.scatter(px, py, c=point_colors, marker='o')
+    ax.autoscale_view()
+    ax.set_title(panel.title)
+    ax.set_xlabel(panel.xlabel)
+    ax.set_ylabel(panel.ylabel)
+    marker = 'o' if panel.points_x is not None else None
+    handles = [Line2D([], [], color=color, marker=marker, label=label) for color, label in zip(colors, panel.labels)]
+    legend = dict(panel.legend)
+    if legend.get('loc', 'best') == 'best' and 'bbox_to_anchor' not in legend:
+        legend['loc'] = _legend_location(ax, x, y, panel.labels)
+    ax.legend(handles=handles, **legend)
+    ax.grid(panel.grid)
+
+
+# Отрисовка одной фигуры в PNG, возвращает путь
+def render(spec: FigureSpec, max_points: int = MAX_POINTS) -> str:
+    figure = Figure(figsize=spec.size, dpi=spec.dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.subplots(1, len(spec.panels), squeeze=False)[0]
+    margins = MARGINS | spec.margins
+    width, height = spec.size
+    top = margins['top'] + (margins['title'] if spec.title else 0.0)
+    panel_width = (width - margins['left'] - margins['right'] - margins['space'] * (len(axes) - 1)) / len(axes)
+    figure.subplots_adjust(left=margins['left'] / width, right=1 - margins['right'] / width,
+                           bottom=margins['bottom'] / height, top=1 - top / height,
+                           wspace=margins['space'] / panel_width)
+    for ax, panel in zip(axes, spec.panels):
+        _draw_panel(ax, panel, max_points)
+    if spec.title:
+        figure.suptitle(spec.title)
+    figure.savefig(spec.path, pil_kwargs={'compress_level': COMPRESS_LEVEL})
+    return spec.path
+
+
+# Отрисовка набора фигур: в пуле процессов (processes=None - по числу ядер) или последовательно (processes=1)
+def render_many(specs: list[FigureSpec], processes: int | None = None, max_points: int = MAX_POINTS) -> list[str]:
+    if processes == 1 or len(specs) <= 1:
+        return [render(spec, max_points) for spec in specs]
+    with Pool(processes) as pool:
+        return pool.starmap(render, [(spec, max_points) for spec in specs], chunksize=max(len(specs) // (4 * (processes or os.cpu_count() or 1)), 1))
+
+
+if __name__ == "__main__":
+    from thermodynamic import piecewise_properties, piecewise_tables
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    names = ['Hydrogen', 'Water', 'Methane', 'Carbon Monoxide', 'Carbon Dioxide', 'Acethylene']
+    tables = piecewise_tables(names)
+    T = np.linspace(300, 800, 100000)
+    start = time.perf_counter()
+    H, S, G = piecewise_properties(tables, T)
+    print(f"H, S, G: {len(names)} x {len(T)} точек, {time.perf_counter() - start:.3f} s")
+
+    with tempfile.TemporaryDirectory() as folder:
+        specs = [
+            FigureSpec([
+                Panel(T, H + i, names, title='H [kJ/mol]'),
+                Panel(T, 1e3 * S, names, title='S [J/mol/K]'),
+                Panel(T, G, names, title='G [kJ/mol]'),
+            ], os.path.join(folder, f'report-{i:04d}.png'), size=(15, 4))
+            for i in range(count)
+        ]
+        for processes in (1, None):
+            start = time.perf_counter()
+            render_many(specs, processes)
+            print(f"{count} PNG по {3 * len(names)} кривых x {len(T)} точек, процессов {processes or os.cpu_count()}: "
+                  f"{time.perf_counter() - start:.2f} s")
@@ -0,0 +1,150 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator
+import os
+import re
+import sqlite3
+
+from table_cache import load_table
+
+# Таблица коэффициентов по умолчанию (лежит рядом с модулем)
+DEFAULT_FILEPATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test-tab-04.csv')
+
+# Перевод калорий в джоули (данные unit-03 хранятся в кал и ккал)
+CAL_TO_J = 4.1868
+
+
+# Приведение обозначения к простой формуле: '$C_4H_{10}$' -> 'C4H10'
+def normalize_formula(notation: str) -> str:
+    return re.sub(r'[\s${}_]', '', notation)
+
+
+# Неизменяемая запись с коэффициентами вещества.
+# Delta_H - кДж/моль, Delta_S - кДж/(моль K), A..D - коэффициенты Cp в Дж/(моль K)
+@dataclass(frozen=True, slots=True)
+class SpeciesRecord:
+    Name: str
+    Formula: str
+    Delta_H: float
+    Delta_S: float
+    A: float
+    B: float
+    C: float
+    D: float
+    T_min: float
+    T_max: float
+    State: str | None = None
+
+
+# Вещество может занимать несколько строк таблицы - участки температуры со своими коэффициентами Cp
+# (как в таблицах NIST/JANAF). Основная запись вещества - участок с наименьшей T_min,
+# Delta_H и Delta_S берутся из нее, в остальных участках они не используются
+class SpeciesRegistry:
+    def __init__(self, records: list[SpeciesRecord]):
+        self._segments = {}
+        for record in records:
+            self._segments.setdefault(record.Name, []).append(record)
+        self._segments = {name: tuple(sorted(segments, key=lambda record: record.T_min))
+                          for name, segments in self._segments.items()}
+        self._records = tuple(segments[0] for segments in self._segments.values())
+        self._by_name = {record.Name: record for record in self._records}
+        self._by_formula = {}
+        for record in self._records:
+            # При совпадении формул остается первая запись
+            self._by_formula.setdefault(record.Formula, record)
+
+    # Загрузка таблицы test-tab-04.csv (через бинарный кэш, CSV разбирается только после изменения файла)
+    @classmethod
+    def from_csv(cls, filepath: str) -> 'SpeciesRegistry':
+        data = load_table(filepath)
+        numeric = zip(*(data[name].tolist() for name in ('$\\Delta H_f$', '$S_f$', 'A', 'B', 'C', 'D', '$T_1$', '$T_2$')))
+        records = [
+            SpeciesRecord(
+                Name=name,
+                Formula=normalize_formula(notation),
+                Delta_H=delta_h,
+                Delta_S=s * 1e-3,
+                A=a,
+                B=b,
+                C=c,
+                D=d,
+                T_min=t_min,
+                T_max=t_max,
+                State=state,
+            )
+            for name, notation, state, (delta_h, s, a, b, c, d, t_min, t_max)
+            in zip(data['Compound'], data['Notation'], data['State'], numeric)
+        ]
+        return cls(records)
+
+    # Загрузка таблиц compound/thermodynamic из базы unit-03
+    @classmethod
+    def from_sqlite(cls, filepath: str) -> 'SpeciesRegistry':
+        query = """
+            SELECT c.name, t.formula, t.delta_ho_298, t.so_298, t.a, t.b, t.c, t.d, t.t_min, t.t_max
+            FROM thermodynamic t JOIN compound c ON c.id = t.compound_id
+        """
+        with sqlite3.connect(filepath) as connection:
+            rows = connection.execute(query).fetchall()
+        records = [
+            SpeciesRecord(
+                Name=name,
+                Formula=normalize_formula(formula),
+                Delta_H=delta_h * CAL_TO_J,
+                Delta_S=s * CAL_TO_J * 1e-3,
+                A=a,
+                B=b,
+                C=c,
+                D=d,
+                T_min=t_min,
+                T_max=t_max,
+            )
+            for name, formula, delta_h, s, a, b, c, d, t_min, t_max in rows
+        ]
+        return cls(records)
+
+    # Поиск по названию, а затем по формуле ('Water', 'H2O' или '$H_2O$')
+    def get(self, key: str) -> SpeciesRecord:
+        if key in self._by_name:
+            return self._by_name[key]
+        formula = normalize_formula(key)
+        if formula in self._by_formula:
+            return self._by_formula[formula]
+        raise KeyError(f'Вещество не найдено: {key}')
+
+    def __getitem__(self, key: str) -> SpeciesRecord:
+        return self.get(key)
+
+    # Все участки температуры вещества в порядке возрастания T_min
+    def segments(self, key: str) -> tuple[SpeciesRecord, ...]:
+        return self._segments[self.get(key).Name]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._by_name or normalize_formula(key) in self._by_formula
+
+    def __iter__(self) -> Iterator[SpeciesRecord]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._by_name)
+
+
+@lru_cache(maxsize=None)
+def _load_registry(filepath: str) -> SpeciesRegistry:
+    if filepath.endswith(('.db', '.sqlite', '.sqlite3')):
+        return SpeciesRegistry.from_sqlite(filepath)
+    return SpeciesRegistry.from_csv(filepath)
+
+
+# Общий для процесса реестр: каждый файл читается один раз
+def get_registry(filepath: str = DEFAULT_FILEPATH) -> SpeciesRegistry:
+    return _load_registry(os.path.abspath(filepath))
+
+
+# Сброс реестров (например, после изменения файла с данными)
+def clear_registry():
+    _load_registry.cache_clear()
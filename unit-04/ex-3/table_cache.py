@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Бинарный кэш разобранных CSV-таблиц. Формат файла:
+#   MAGIC (8 байт) | длина заголовка (uint64, little-endian) | заголовок JSON | выравнивание до DATA_ALIGN |
+#   числовые колонки float64 подряд (колонка за колонкой)
+# В заголовке: версия, mtime/размер/sha256 исходного файла, число строк, имена числовых колонок
+# и значения текстовых колонок (они небольшие и хранятся прямо в JSON)
+MAGIC = b'TBLCACHE'
+# Версия 2: пустые ячейки числовых колонок читаются как NaN (прежний кэш хранил такие колонки как текст)
+VERSION = 2
+DATA_ALIGN = 64
+
+# Кэш лежит в подпапке рядом с исходным файлом (по аналогии с __pycache__)
+CACHE_DIR = '__tablecache__'
+
+
+# Таблица из кэша: числовые колонки - представления np.memmap (без копирования), текстовые - списки
+@dataclass
+class CachedTable:
+    columns: dict[str, np.ndarray]
+    strings: dict[str, list[str]]
+    data: np.ndarray  # (колонки x строки), все числовые колонки
+
+    def __getitem__(self, name: str):
+        if name in self.columns:
+            return self.columns[name]
+        return self.strings[name]
+
+    def __len__(self) -> int:
+        return self.data.shape[1]
+
+    # Несколько колонок как (строки x колонки). Если колонки идут подряд в кэше, результат - представление
+    def stack(self, names) -> np.ndarray:
+        order = list(self.columns)
+        indices = [order.index(name) for name in names]
+        if indices == list(range(indices[0], indices[0] + len(indices))):
+            return self.data[indices[0]:indices[0] + len(indices)].T
+        return self.data[indices].T
+
+
+def cache_path(source: str) -> str:
+    folder, name = os.path.split(os.path.abspath(source))
+    return os.path.join(folder, CACHE_DIR, name + '.bin')
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Разбор CSV без pandas: колонка числовая, если все ее непустые значения приводятся к float.
+# Пустые ячейки числовой колонки (пропуски в таблице) становятся NaN; колонка только из пустых ячеек
+# остается текстовой, так как по ней нельзя определить тип
+def parse_csv(source: str) -> tuple[dict[str, np.ndarray], dict[str, list[str]]]:
+    with open(source, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        values = list(zip(*reader)) or [()] * len(header)
+    columns, strings = {}, {}
+    for name, column in zip(header, values):
+        filled = [bool(cell.strip()) for cell in column]
+        if column and not any(filled):
+            strings[name] = list(column)
+            continue
+        try:
+            columns[name] = np.array([cell if full else 'nan' for cell, full in zip(column, filled)], dtype=np.float64)
+        except ValueError:
+            strings[name] = list(column)
+    return columns, strings
+
+
+def _read_header(path: str) -> tuple[dict, int] | None:
+    try:
+        with open(path, 'rb') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                return None
+            length = int.from_bytes(file.read(8), 'little')
+            header = json.loads(file.read(length))
+    except (OSError, ValueError):
+        return None
+    if header.get('version') != VERSION:
+        return None
+    offset = -(-(len(MAGIC) + 8 + length) // DATA_ALIGN) * DATA_ALIGN
+    return header, offset
+
+
+def _write(path: str, header: dict, columns: dict[str, np.ndarray]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    encoded = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    offset = -(-(len(MAGIC) + 8 + len(encoded)) // DATA_ALIGN) * DATA_ALIGN
+    # Запись во временный файл и атомарная замена: параллельные читатели не увидят неполный кэш
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(MAGIC)
+        file.write(len(encoded).to_bytes(8, 'little'))
+        file.write(encoded)
+        file.write(b'\0' * (offset - len(MAGIC) - 8 - len(encoded)))
+        for column in columns.values():
+            file.write(np.ascontiguousarray(column, dtype='<f8').tobytes())
+    os.replace(temporary, path)
+
+
+def _open(path: str, header: dict, offset: int) -> CachedTable:
+    names, rows = header['columns'], header['rows']
+    if names and rows:
+        data = np.memmap(path, dtype='<f8', mode='r', offset=offset, shape=(len(names), rows))
+    else:
+        data = np.empty((len(names), rows))
+    return CachedTable(dict(zip(names, data)), header['strings'], data)
+
+
+# Таблица из CSV через бинарный кэш. Кэш действителен, если совпадают mtime и размер исходного файла;
+# если изменилось только время (файл переписан без изменений), проверяется sha256.
+# Иначе CSV разбирается заново и кэш перезаписывается. Если кэш записать нельзя, таблица остается в памяти
+def load_table(source: str) -> CachedTable:
+    stat = os.stat(source)
+    path = cache_path(source)
+    cached = _read_header(path)
+    if cached is not None:
+        header, offset = cached
+        if header['size'] == stat.st_size:
+            if header['mtime_ns'] == stat.st_mtime_ns:
+                return _open(path, header, offset)
+            sha256 = _sha256(source)
+            if header['sha256'] == sha256:
+                table = _open(path, header, offset)
+                header['mtime_ns'] = stat.st_mtime_ns
+                columns = {name: np.array(column) for name, column in table.columns.items()}
+                try:
+                    _write(path, header, columns)
+                except OSError:
+                    pass
+                return table
+
+    columns, strings = parse_csv(source)
+    header = {
+        'version': VERSION,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': _sha256(source),
+        'rows': len(next(iter(columns.values()))) if columns else len(next(iter(strings.values()), [])),
+        'columns': list(columns),
+        'strings': strings,
+    }
+    try:
+        _write(path, header, columns)
+    except OSError:
+        data = np.array(list(columns.values())).reshape(len(columns), header['rows'])
+        return CachedTable(dict(zip(columns, data)), strings, data)
+    return _open(path, header, _read_header(path)[1])
+
+
+if __name__ == "__main__":
+    for source in sys.argv[1:] or [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test-tab-04.csv')]:
+        start = time.perf_counter()
+        table = load_table(source)
+        print(f"{source}: строк {len(table)}, числовых колонок {len(table.columns)}, {time.perf_counter() - start:.4f} s")
@@ -0,0 +1,343 @@
+from bisect import bisect_right
+from functools import lru_cache
+import math
+import warnings
+
+import numpy as np
+from species import DEFAULT_FILEPATH, SpeciesRecord, get_registry
+
+# Нижний предел интегрирования теплоемкости, K
+T_REF = 298
+
+# Стандартные значения в таблицах заданы при 298.15 K, а интегрирование ведется от T_REF.
+# Если участок начинается не дальше этого расстояния выше T_REF, его граница опускается до T_REF
+REFERENCE_TOLERANCE = 1.0
+
+# Что делать с температурами вне диапазона коэффициентов:
+#   'raise' - исключение TemperatureRangeError,
+#   'warn'  - предупреждение TemperatureRangeWarning и расчет по ближайшему участку,
+#   'nan'   - NaN в этих точках
+RANGE_POLICIES = ('raise', 'warn', 'nan')
+
+
+class TemperatureRangeError(ValueError):
+    pass
+
+
+class TemperatureRangeWarning(UserWarning):
+    pass
+
+
+# Теплоемкость Cp = a + b*1e-3*T + c*1e5*T^-2 + d*1e-6*T^2, кДж/(моль K).
+# Коэффициенты и температура могут быть массивами, действуют правила broadcasting
+def heat_capacity(A, B, C, D, T):
+    T = np.asarray(T, dtype=float)
+    return 1e-3 * (A + B * 1e-3 * T + C * 1e5 * np.pow(T, -2) + D * 1e-6 * np.pow(T, 2))
+
+
+# Точная первообразная: интеграл Cp dT от T_ref до T, кДж/моль
+def enthalpy_integral(A, B, C, D, T, T_ref: float = T_REF):
+    T = np.asarray(T, dtype=float)
+    return 1e-3 * (A * (T - T_ref)
+                   + B * 1e-3 / 2 * (np.pow(T, 2) - T_ref ** 2)
+                   - C * 1e5 * (1 / T - 1 / T_ref)
+                   + D * 1e-6 / 3 * (np.pow(T, 3) - T_ref ** 3))
+
+
+# Точная первообразная: интеграл Cp/T dT от T_ref до T, кДж/(моль K)
+def entropy_integral(A, B, C, D, T, T_ref: float = T_REF):
+    T = np.asarray(T, dtype=float)
+    return 1e-3 * (A * np.log(T / T_ref)
+                   + B * 1e-3 * (T - T_ref)
+                   - C * 1e5 / 2 * (np.pow(T, -2) - T_ref ** -2)
+                   + D * 1e-6 / 2 * (np.pow(T, 2) - T_ref ** 2))
+
+
+# Порядок столбцов матрицы коэффициентов
+COEFFICIENTS = ('Delta_H', 'Delta_S', 'A', 'B', 'C', 'D')
+
+
+# Матрица коэффициентов (n x 6) для набора веществ (SpeciesRecord или Thermodynamic)
+def coefficient_matrix(compounds) -> np.ndarray:
+    return np.array([[getattr(compound, name) for name in COEFFICIENTS] for compound in compounds], dtype=float)
+
+
+# Базисные функции температуры (6 x N): coefficients @ basis дает H, кДж/моль
+def enthalpy_basis(T, T_ref: float = T_REF) -> np.ndarray:
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    return np.stack([
+        np.ones_like(T),
+        np.zeros_like(T),
+        1e-3 * (T - T_ref),
+        1e-6 / 2 * (np.pow(T, 2) - T_ref ** 2),
+        -1e2 * (1 / T - 1 / T_ref),
+        1e-9 / 3 * (np.pow(T, 3) - T_ref ** 3),
+    ])
+
+
+# Базисные функции температуры (6 x N): coefficients @ basis дает S, кДж/(моль K)
+def entropy_basis(T, T_ref: float = T_REF) -> np.ndarray:
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    return np.stack([
+        np.zeros_like(T),
+        np.ones_like(T),
+        1e-3 * np.log(T / T_ref),
+        1e-6 * (T - T_ref),
+        -1e2 / 2 * (np.pow(T, -2) - T_ref ** -2),
+        1e-9 / 2 * (np.pow(T, 2) - T_ref ** 2),
+    ])
+
+
+# H, S и G сразу для всех строк матрицы коэффициентов на сетке температур, (n x N)
+def properties(coefficients: np.ndarray, T) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    H = coefficients @ enthalpy_basis(T)
+    S = coefficients @ entropy_basis(T)
+    return H, S, H - T * S
+
+
+# Кусочная теплоемкость вещества: участки [edges[i], edges[i + 1]] со своими коэффициентами.
+# H_edges, S_edges - накопленные H и S на границах участков (непрерывны при переходе между участками).
+# rows - строки в порядке COEFFICIENTS, где Delta_H, Delta_S заменены постоянными участка:
+# на участке i H = rows[i] @ enthalpy_basis(T), S = rows[i] @ entropy_basis(T),
+# поэтому расчет остается точным и матричным, как для одного набора коэффициентов
+class PiecewiseCp:
+    def __init__(self, segments: tuple[SpeciesRecord, ...]):
+        first = segments[0]
+        self.Name = first.Name
+        edges = [first.T_min] + [record.T_max for record in segments]
+        for previous, record in zip(segments, segments[1:]):
+            if not np.isclose(previous.T_max, record.T_min):
+                raise ValueError(f'Участки {self.Name} не стыкуются: {previous.T_max} K и {record.T_min} K')
+        if T_REF < edges[0] <= T_REF + REFERENCE_TOLERANCE:
+            edges[0] = T_REF
+        self.edges = np.array(edges, dtype=float)
+        self.coefficients = coefficient_matrix(segments)[:, 2:]
+
+        # H и S переносятся от T_REF к границам участков: вверх - по участкам выше опорного, вниз - ниже
+        reference = int(np.clip(np.searchsorted(self.edges, T_REF, side='right') - 1, 0, len(segments) - 1))
+        A, B, C, D = self.coefficients.T
+        lower, upper = self.edges[:-1], self.edges[1:]
+        # Граница участка со стороны опорного: нижняя для участков выше, верхняя для участков ниже
+        edge = np.arange(len(segments)) + (np.arange(len(segments)) < reference)
+        # Граница 0 K (встречается в таблицах) дает бесконечные H, S на самой границе, для расчета она не нужна
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dH = enthalpy_integral(A, B, C, D, upper, lower)
+            dS = entropy_integral(A, B, C, D, upper, lower)
+            base_H = enthalpy_integral(A, B, C, D, self.edges[edge])
+            base_S = entropy_integral(A, B, C, D, self.edges[edge])
+            H = np.empty(len(self.edges))
+            S = np.empty(len(self.edges))
+            ref = self.coefficients[reference]
+            H[reference] = first.Delta_H - enthalpy_integral(*ref, T_REF, lower[reference])
+            S[reference] = first.Delta_S - entropy_integral(*ref, T_REF, lower[reference])
+            H[reference + 1] = first.Delta_H + enthalpy_integral(*ref, upper[reference])
+            S[reference + 1] = first.Delta_S + entropy_integral(*ref, upper[reference])
+        for i in range(reference + 2, len(self.edges)):
+            H[i], S[i] = H[i - 1] + dH[i - 1], S[i - 1] + dS[i - 1]
+        for i in range(reference - 1, -1, -1):
+            H[i], S[i] = H[i + 1] - dH[i], S[i + 1] - dS[i]
+        self.H_edges, self.S_edges = H, S
+
+        # Постоянные участков: H(T) = H_i + int_T_REF^T Cp_i. Для опорного участка H_i = Delta_H,
+        # для остальных H_i находится по границе со стороны опорного участка
+        H_offset, S_offset = H[edge] - base_H, S[edge] - base_S
+        H_offset[reference], S_offset[reference] = first.Delta_H, first.Delta_S
+        self.rows = np.column_stack([H_offset, S_offset, self.coefficients])
+        # Те же строки и границы в виде float для расчета одной температуры без numpy
+        self._rows = [tuple(float(value) for value in row) for row in self.rows]
+        self._edges = [float(edge) for edge in self.edges]
+
+    @property
+    def T_min(self) -> float:
+        return float(self.edges[0])
+
+    @property
+    def T_max(self) -> float:
+        return float(self.edges[-1])
+
+    def in_range(self, T) -> np.ndarray:
+        T = np.asarray(T, dtype=float)
+        return (T >= self.edges[0]) & (T <= self.edges[-1])
+
+    # Номер участка для каждой температуры (вне диапазона - ближайший участок) и маска попадания в диапазон
+    def segment_index(self, T) -> tuple[np.ndarray, np.ndarray]:
+        T = np.asarray(T, dtype=float)
+        index = np.clip(np.searchsorted(self.edges, T, side='right') - 1, 0, len(self.rows) - 1)
+        return index, self.in_range(T)
+
+    # Коэффициенты A, B, C, D участков для каждой температуры (без проверки диапазона)
+    def coefficients_at(self, T) -> np.ndarray:
+        return np.moveaxis(self.coefficients[self.segment_index(T)[0]], -1, 0)
+
+    def heat_capacity(self, T, on_range: str = 'raise'):
+        inside = self.in_range(T)
+        check_range([self], inside[np.newaxis], T, on_range)
+        Cp = heat_capacity(*self.coefficients_at(T), T)
+        return np.where(inside, Cp, np.nan) if on_range == 'nan' else Cp
+
+    # Одно свойство kind ('H', 'S' или 'G') при одной температуре внутри диапазона:
+    # замкнутые формулы на float, без массивов и проверки диапазона
+    def scalar_value(self, kind: str, T: float) -> float:
+        i = min(max(bisect_right(self._edges, T) - 1, 0), len(self._rows) - 1)
+        H_offset, S_offset, A, B, C, D = self._rows[i]
+        if kind != 'S':
+            H = H_offset + 1e-3 * (A * (T - T_REF)
+                                   + B * 1e-3 / 2 * (T * T - T_REF ** 2)
+                                   - C * 1e5 * (1 / T - 1 / T_REF)
+                                   + D * 1e-6 / 3 * (T ** 3 - T_REF ** 3))
+            if kind == 'H':
+                return H
+        S = S_offset + 1e-3 * (A * math.log(T / T_REF)
+                               + B * 1e-3 * (T - T_REF)
+                               - C * 1e5 / 2 * (T ** -2 - T_REF ** -2)
+                               + D * 1e-6 / 2 * (T * T - T_REF ** 2))
+        return S if kind == 'S' else H - T * S
+
+    # Одно свойство kind на массиве температур (без проверки диапазона). У вещества с одним участком
+    # коэффициенты общие, иначе строки участков выбираются по индексу; считается только нужное свойство
+    def array_value(self, kind: str, T: np.ndarray) -> np.ndarray:
+        if len(self._rows) == 1:
+            H_offset, S_offset, A, B, C, D = self._rows[0]
+        else:
+            H_offset, S_offset, A, B, C, D = np.moveaxis(self.rows[self.segment_index(T)[0]], -1, 0)
+        if kind != 'S':
+            H = H_offset + enthalpy_integral(A, B, C, D, T)
+            if kind == 'H':
+                return H
+        S = S_offset + entropy_integral(A, B, C, D, T)
+        return S if kind == 'S' else H - T * S
+
+
+# Реакция на температуры вне диапазона: inside - маска (вещества x T)
+def check_range(tables: list[PiecewiseCp], inside: np.ndarray, T, on_range: str):
+    if on_range not in RANGE_POLICIES:
+        raise ValueError(f'Неизвестный режим проверки диапазона: {on_range}')
+    if on_range == 'nan' or np.all(inside):
+        return
+    T = np.broadcast_to(np.asarray(T, dtype=float), inside.shape[1:])
+    outside = [f'{table.Name} [{table.T_min:g}, {table.T_max:g}] K: T = {np.min(T[~row]):g}..{np.max(T[~row]):g} K'
+               for table, row in zip(tables, inside) if not np.all(row)]
+    message = 'Температура вне диапазона коэффициентов: ' + '; '.join(outside)
+    if on_range == 'raise':
+        raise TemperatureRangeError(message)
+    warnings.warn(message, TemperatureRangeWarning, stacklevel=3)
+
+
+# Таблица участков строится один раз для каждого набора записей (записи неизменяемы и хешируемы)
+@lru_cache(maxsize=None)
+def piecewise(segments: tuple[SpeciesRecord, ...]) -> PiecewiseCp:
+    return PiecewiseCp(segments)
+
+
+# Кусочные таблицы веществ из реестра по названиям или формулам
+def piecewise_tables(names: list[str], filepath: str = DEFAULT_FILEPATH) -> list[PiecewiseCp]:
+    registry = get_registry(filepath)
+    return [piecewise(registry.segments(name)) for name in names]
+
+
+# Строки коэффициентов набора таблиц одной матрицей и смещения таблиц в ней (собираются один раз на набор)
+@lru_cache(maxsize=256)
+def _stacked_rows(tables: tuple[PiecewiseCp, ...]) -> tuple[np.ndarray, np.ndarray]:
+    offsets = np.cumsum([0] + [len(table.rows) for table in tables[:-1]])
+    return np.concatenate([table.rows for table in tables]), offsets
+
+
+# H, S и G веществ с кусочной теплоемкостью на сетке температур, (n x N), и маска попадания в диапазон.
+# Участок для каждой пары (вещество, T) ищется через searchsorted, затем строки коэффициентов
+# всех участков умножаются на общие базисные функции одной операцией. Диапазон здесь не проверяется
+def piecewise_values(tables: list[PiecewiseCp], T) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    rows, offsets = _stacked_rows(tuple(tables))
+    index, inside = np.empty((len(tables), len(T)), dtype=int), np.empty((len(tables), len(T)), dtype=bool)
+    for i, table in enumerate(tables):
+        index[i], inside[i] = table.segment_index(T)
+    selected = rows[index + offsets[:, np.newaxis]]
+    H = np.einsum('snk,kn->sn', selected, enthalpy_basis(T))
+    S = np.einsum('snk,kn->sn', selected, entropy_basis(T))
+    return H, S, H - T * S, inside
+
+
+# То же с проверкой диапазона по правилу on_range
+def piecewise_properties(tables: list[PiecewiseCp], T, on_range: str = 'raise') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    H, S, G, inside = piecewise_values(tables, T)
+    check_range(tables, inside, T, on_range)
+    if on_range == 'nan':
+        H, S, G = (np.where(inside, value, np.nan) for value in (H, S, G))
+    return H, S, G
+
+
+class Thermodynamic:
+    def __init__(self, name: str, filepath: str = DEFAULT_FILEPATH, on_range: str = 'raise'):
+        registry = get_registry(filepath)
+        record = registry[name]
+        self.Name = record.Name
+        self.Formula = record.Formula
+        self.Delta_H = record.Delta_H
+        self.Delta_S = record.Delta_S
+        self.A = record.A
+        self.B = record.B
+        self.C = record.C
+        self.D = record.D
+        # A..D - коэффициенты первого участка, расчет ведется по всем участкам
+        self.Segments = piecewise(registry.segments(name))
+        self.T_min = self.Segments.T_min
+        self.T_max = self.Segments.T_max
+        if on_range not in RANGE_POLICIES:
+            raise ValueError(f'Неизвестный режим проверки диапазона: {on_range}')
+        self.on_range = on_range
+
+    # Все методы принимают как число, так и массив температур.
+    # Вне диапазона T_min..T_max поведение задается on_range (по умолчанию - исключение)
+
+    # Одна температура внутри диапазона считается сразу по формулам участка,
+    # массив и температуры вне диапазона - с проверкой по правилу on_range
+    def _value(self, kind: str, T):
+        if isinstance(T, (int, float)) and self.T_min <= T <= self.T_max:
+            return self.Segments.scalar_value(kind, float(T))
+        T = np.asarray(T, dtype=float)
+        inside = self.Segments.in_range(T)
+        if not inside.all():
+            check_range([self.Segments], inside.reshape(1, -1), T.ravel(), self.on_range)
+        value = self.Segments.array_value(kind, T)
+        return np.where(inside, value, np.nan) if self.on_range == 'nan' else value
+
+    def heat_capacity(self, T):
+        return self.Segments.heat_capacity(T, self.on_range)
+
+    def enthalpy(self, T):
+        return self._value('H', T)
+
+    def entropy(self, T):
+        return self._value('S', T)
+
+    def gibbs_energy(self, T):
+        return self._value('G', T)
+
+    # Расчет численным интегрированием (прежний способ), только для одной температуры.
+    # scipy импортируется при первом вызове, основному расчету он не нужен
+
+    def enthalpy_quad(self, T: float) -> float:
+        from scipy import integrate
+        return self.Delta_H + integrate.quad(self.heat_capacity, T_REF, T)[0]
+
+    def entropy_quad(self, T: float) -> float:
+        from scipy import integrate
+        return self.Delta_S + integrate.quad(lambda x: self.heat_capacity(x) / x, T_REF, T)[0]
+
+    def gibbs_energy_quad(self, T: float) -> float:
+        return self.enthalpy_quad(T) - T * self.entropy_quad(T)
+
+
+# Сравнение аналитического расчета с численным интегрированием:
+# возвращает максимальные абсолютные отклонения H, S и G на сетке температур
+def check_against_quad(compound: Thermodynamic, T: np.ndarray) -> dict[str, float]:
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    H_quad = np.array([compound.enthalpy_quad(T_i) for T_i in T])
+    S_quad = np.array([compound.entropy_quad(T_i) for T_i in T])
+    G_quad = H_quad - T * S_quad
+    return {
+        'H': float(np.max(np.abs(compound.enthalpy(T) - H_quad))),
+        'S': float(np.max(np.abs(compound.entropy(T) - S_quad))),
+        'G': float(np.max(np.abs(compound.gibbs_energy(T) - G_quad))),
+    }
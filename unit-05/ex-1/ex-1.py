@@ -1,65 +1,24 @@
-from scipy import integrate
 import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
+import os
+import sys
 
-class Thermodynamic:
-    def __init__(self, name: str):
-        cols = ['Compound', '$\\Delta H_f$', '$S_f$', 'A', 'B', 'C', 'D', '$T_1$', '$T_2$']
-        data = pd.read_csv('unit-04/ex-3/test-tab-04.csv', usecols=cols)
-        compound_data = data.loc[data['Compound'] == name]
-        self.Name = name
-        self.Delta_H = float(compound_data['$\\Delta H_f$'].values[0])
-        self.Delta_S = float(compound_data['$S_f$'].values[0]) * 1e-3
-        self.A = float(compound_data['A'].values[0])
-        self.B = float(compound_data['B'].values[0])
-        self.C = float(compound_data['C'].values[0])
-        self.D = float(compound_data['D'].values[0])
-        self.T_min = float(compound_data['$T_1$'].values[0])
-        self.T_max = float(compound_data['$T_2$'].values[0])
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'unit-04', 'ex-3'))
 
-    def heat_capacity(self, T: float) -> float:
-        return 1e-3 * (self.A + self.B * 1e-3 * T + self.C * 1e5 * np.pow(T, -2) + self.D * 1e-6 * np.pow(T, 2))
+from reaction import screen_reactions, temperature_range
+from rendering import FigureSpec, Panel, render_many
 
-    def enthalpy(self, T: float):
-        return self.Delta_H + integrate.quad(self.heat_capacity, 298, T)[0]
-
-    def entropy(self, T: float):
-        return self.Delta_S + integrate.quad(lambda x: self.heat_capacity(x) / x, 298, T)[0]
-
-    def gibbs_energy(self, T: float):
-        return self.enthalpy(T) - T * self.entropy(T)
-
-def process_reaction(T_list: np.ndarray, Delta_H_298: float, Delta_S_298: float, Delta_C_p_T: callable) -> tuple[np.ndarray, np.ndarray]:
-    Delta_H_list = []
-    Delta_G_list = []
-    for T in T_list:
-        Delta_H_T = Delta_H_298 + integrate.quad(Delta_C_p_T, 298, T)[0]
-        Delta_S_T = Delta_S_298 + integrate.quad(lambda x: Delta_C_p_T(x) / x, 298, T)[0]
-        Delta_G_T = Delta_H_T - T * Delta_S_T
-        Delta_H_list.append(Delta_H_T)
-        Delta_G_list.append(Delta_G_T)
-    return np.array(Delta_H_list), np.array(Delta_G_list)
+def process_reaction(T_list: np.ndarray, reactions: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    # Все реакции на всей сетке температур считаются одной матричной операцией
+    result = screen_reactions(reactions, T_list)
+    return result['Delta_H'], result['Delta_G']
 
 def hydrogen_combustion_reaction(T_list: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-    # 2H2 + O2 = 2H2O
-    hydrogen = Thermodynamic('Hydrogen')
-    oxygen = Thermodynamic('Oxygen')
-    water = Thermodynamic('Water')
-    Delta_H_298 = 2 * water.Delta_H - 2 * hydrogen.Delta_H - oxygen.Delta_H     
-    Delta_S_298 = 2 * water.Delta_S - 2 * hydrogen.Delta_S - oxygen.Delta_S
-    Delta_C_p_T = lambda T: 2 * water.heat_capacity(T) - 2 * hydrogen.heat_capacity(T) - oxygen.heat_capacity(T)
-    return process_reaction(T_list, Delta_H_298, Delta_S_298, Delta_C_p_T)
+    Delta_H, Delta_G = process_reaction(T_list, ['2H2 + O2 = 2H2O'])
+    return Delta_H[0], Delta_G[0]
 
 def carbon_monoxide_combustion_reaction(T_list: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-    # 2CO + O2 = 2CO2
-    carbon_monoxide = Thermodynamic('Carbon Monoxide')
-    oxygen = Thermodynamic('Oxygen')
-    carbon_dioxide = Thermodynamic('Carbon Dioxide')
-    Delta_H_298 = 2 * carbon_dioxide.Delta_H - 2 * carbon_monoxide.Delta_H - oxygen.Delta_H
-    Delta_S_298 = 2 * carbon_dioxide.Delta_S - 2 * carbon_monoxide.Delta_S - oxygen.Delta_S
-    Delta_C_p_T = lambda T: 2 * carbon_dioxide.heat_capacity(T) - 2 * carbon_monoxide.heat_capacity(T) - oxygen.heat_capacity(T)
-    return process_reaction(T_list, Delta_H_298, Delta_S_298, Delta_C_p_T)
+    Delta_H, Delta_G = process_reaction(T_list, ['2CO + O2 = 2CO2'])
+    return Delta_H[0], Delta_G[0]
 
 def main():
     N = 10
@@ -69,39 +28,25 @@ def main():
 
     hydrogen_Delta_H, hydrogen_Delta_G = hydrogen_combustion_reaction(T_list)
     carbon_monoxide_Delta_H, carbon_monoxide_Delta_G = carbon_monoxide_combustion_reaction(T_list)
-    
-    hydrogen_ECE = hydrogen_Delta_G / hydrogen_Delta_H * 100
-    carbon_monoxide_ECE = carbon_monoxide_Delta_G / carbon_monoxide_Delta_H * 100
-
-    fig1, (ax_Delta_H, ax_Delta_G) = plt.subplots(1, 2)
-    fig1.set_figheight(4)
-    fig1.set_figwidth(8)
 
-    ax_Delta_H.plot(T_list, hydrogen_Delta_H, label='H2')
-    ax_Delta_H.plot(T_list, carbon_monoxide_Delta_H, label='CO')
-    ax_Delta_H.set_title('dH [kJ/mol]')
-    ax_Delta_H.set_xlabel('T, K')
-    ax_Delta_H.legend()
-
-    ax_Delta_G.plot(T_list, hydrogen_Delta_G, label='H2')
-    ax_Delta_G.plot(T_list, carbon_monoxide_Delta_G, label='CO')
-    ax_Delta_G.set_title('dG [kJ/mol]')
-    ax_Delta_G.set_xlabel('T, K')
-    ax_Delta_G.legend()
-
-    fig1.savefig('unit-05/ex-1/dH_dG.png')
+    # Фигуры описываются данными и строятся без pyplot одним вызовом
+    dH_dG = FigureSpec([
+        Panel(T_list, [hydrogen_Delta_H, carbon_monoxide_Delta_H], ['H2', 'CO'], title='dH [kJ/mol]'),
+        Panel(T_list, [hydrogen_Delta_G, carbon_monoxide_Delta_G], ['H2', 'CO'], title='dG [kJ/mol]'),
+    ], 'unit-05/ex-1/dH_dG.png', size=(8, 4))
 
+    # КПД считается на своей сетке до T_max, но не выше диапазона коэффициентов веществ реакции
     T_max = 1100
-    T_list = np.linspace(T_min, T_max, N)
-    
-    plt.figure()
-    plt.plot(T_list, hydrogen_ECE, label='H2')
-    plt.plot(T_list, carbon_monoxide_ECE, label='CO')
-    plt.title('Идеальный КПД, %')
-    plt.xlabel('T, K')
-    plt.legend()
-
-    plt.savefig('unit-05/ex-1/ECE.png')
+    T_ECE, ECE = [], []
+    for equation in ('2H2 + O2 = 2H2O', '2CO + O2 = 2CO2'):
+        T_low, T_high = temperature_range(equation)
+        T_list = np.linspace(max(T_min, T_low), min(T_max, T_high), N)
+        T_ECE.append(T_list)
+        ECE.append(screen_reactions([equation], T_list)['ECE'][0])
+    ECE_spec = FigureSpec([Panel(np.array(T_ECE), np.array(ECE), ['H2', 'CO'], title='Идеальный КПД, %')],
+                          'unit-05/ex-1/ECE.png', size=(6.4, 4.8))
+
+    render_many([dH_dG, ECE_spec], processes=1)
 
     print('Готово!')
 
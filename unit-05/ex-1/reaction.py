@@ -0,0 +1,137 @@
+import numpy as np
+import os
+import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'unit-04', 'ex-3'))
+from species import DEFAULT_FILEPATH, SpeciesRegistry, get_registry
+from gibbs_cache import get_gibbs_cache
+from thermodynamic import PiecewiseCp, piecewise_properties, piecewise_tables
+
+# Универсальная газовая постоянная N_A * k_B, Дж/(моль K) - то же значение, что scipy.constants.R,
+# но без импорта scipy при запуске
+R = 6.02214076e23 * 1.380649e-23
+
+
+# Разбор уравнения реакции: '2H2 + O2 = 2H2O' -> {'Hydrogen': -2, 'Oxygen': -1, 'Water': 2}.
+# Вещества задаются формулой или названием, разделитель сторон '=' или '->'
+def parse_reaction(equation: str, registry: SpeciesRegistry | None = None) -> dict[str, float]:
+    registry = registry or get_registry()
+    sides = re.split(r'\s*(?:->|<=>|=)\s*', equation.strip())
+    if len(sides) != 2:
+        raise ValueError(f'Неверный формат уравнения реакции: {equation}')
+
+    stoichiometry = {}
+    for sign, side in zip((-1, 1), sides):
+        for term in side.split('+'):
+            match = re.match(r'\s*(\d+(?:\.\d+)?)?\s*(.+?)\s*$', term)
+            if not match:
+                raise ValueError(f'Неверный формат уравнения реакции: {equation}')
+            coefficient = float(match.group(1)) if match.group(1) else 1.0
+            name = registry[match.group(2)].Name
+            stoichiometry[name] = stoichiometry.get(name, 0.0) + sign * coefficient
+    return stoichiometry
+
+
+# Стехиометрия с названиями веществ из реестра: ключи-формулы и ключи-названия одного вещества
+# ('H2O' и 'Water') сводятся к одному ключу, коэффициенты при этом складываются
+def canonical_stoichiometry(reaction: dict[str, float], registry: SpeciesRegistry | None = None) -> dict[str, float]:
+    registry = registry or get_registry()
+    stoichiometry = {}
+    for name, coefficient in reaction.items():
+        name = registry[name].Name
+        stoichiometry[name] = stoichiometry.get(name, 0.0) + coefficient
+    return stoichiometry
+
+
+# Стехиометрическая матрица (реакции x вещества) для набора реакций
+def stoichiometry_matrix(reactions: list[dict[str, float]]) -> tuple[list[str], np.ndarray]:
+    species = []
+    for reaction in reactions:
+        species.extend(name for name in reaction if name not in species)
+    nu = np.zeros((len(reactions), len(species)))
+    for i, reaction in enumerate(reactions):
+        for name, coefficient in reaction.items():
+            nu[i, species.index(name)] = coefficient
+    return species, nu
+
+
+# dH, dS, dG, Kp и идеальный КПД для всех реакций на всей сетке температур.
+# nu - стехиометрическая матрица (R x S), tables - кусочные коэффициенты веществ (S).
+# Каждая величина возвращается массивом (R x N). Температуры вне диапазона коэффициентов
+# хотя бы одного вещества обрабатываются по правилу on_range (см. thermodynamic)
+def reaction_properties(nu: np.ndarray, tables: list[PiecewiseCp], T, on_range: str = 'raise') -> dict[str, np.ndarray]:
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    H, S, G = piecewise_properties(tables, T, on_range)
+    Delta_H, Delta_S, Delta_G = nu @ H, nu @ S, nu @ G
+    # Для сильно необратимых реакций Kp уходит в бесконечность, это ожидаемо
+    with np.errstate(over='ignore'):
+        Kp = np.exp(-Delta_G * 1e3 / (R * T))
+    return {
+        'Delta_H': Delta_H,
+        'Delta_S': Delta_S,
+        'Delta_G': Delta_G,
+        'Kp': Kp,
+        'ECE': Delta_G / Delta_H * 100,
+    }
+
+
+# Расчет набора реакций, заданных уравнениями или стехиометрическими словарями
+def screen_reactions(reactions: list[str | dict[str, float]], T, filepath: str = DEFAULT_FILEPATH,
+                     on_range: str = 'raise') -> dict[str, np.ndarray]:
+    registry = get_registry(filepath)
+    reactions = [parse_reaction(r, registry) if isinstance(r, str) else canonical_stoichiometry(r, registry)
+                 for r in reactions]
+    species, nu = stoichiometry_matrix(reactions)
+    return reaction_properties(nu, piecewise_tables(species, filepath), T, on_range)
+
+
+# Общий диапазон температур реакции: пересечение диапазонов коэффициентов всех веществ, K
+def temperature_range(reaction: str | dict[str, float], filepath: str = DEFAULT_FILEPATH) -> tuple[float, float]:
+    registry = get_registry(filepath)
+    reaction = parse_reaction(reaction, registry) if isinstance(reaction, str) else canonical_stoichiometry(reaction, registry)
+    tables = piecewise_tables(list(reaction), filepath)
+    return max(table.T_min for table in tables), min(table.T_max for table in tables)
+
+
+class Reaction:
+    def __init__(self, reaction: str | dict[str, float], filepath: str = DEFAULT_FILEPATH, on_range: str = 'raise'):
+        registry = get_registry(filepath)
+        if isinstance(reaction, str):
+            self.Equation = reaction
+            reaction = parse_reaction(reaction, registry)
+        else:
+            self.Equation = None
+            reaction = canonical_stoichiometry(reaction, registry)
+        self.Stoichiometry = reaction
+        self.nu = np.array([list(reaction.values())], dtype=float)
+        self.Tables = piecewise_tables(list(reaction), filepath)
+        self.T_min = max(table.T_min for table in self.Tables)
+        self.T_max = min(table.T_max for table in self.Tables)
+        self.Filepath = filepath
+        self.on_range = on_range
+
+    def _properties(self, T) -> dict[str, np.ndarray]:
+        T = np.asarray(T, dtype=float)
+        result = reaction_properties(self.nu, self.Tables, T.ravel(), self.on_range)
+        return {key: value[0].reshape(T.shape) for key, value in result.items()}
+
+    def enthalpy(self, T):
+        return self._properties(T)['Delta_H']
+
+    def entropy(self, T):
+        return self._properties(T)['Delta_S']
+
+    # dG° берется из общего кэша энергий Гиббса: повторные расчеты на той же сетке T не пересчитываются
+    def gibbs_energy(self, T):
+        T = np.asarray(T, dtype=float)
+        return get_gibbs_cache(self.Filepath).reaction(self.Stoichiometry, T.ravel(), self.on_range).reshape(T.shape)
+
+    def equilibrium_constant(self, T):
+        T = np.asarray(T, dtype=float)
+        # Для сильно необратимых реакций Kp уходит в бесконечность, это ожидаемо
+        with np.errstate(over='ignore'):
+            return np.exp(-self.gibbs_energy(T) * 1e3 / (R * T))
+
+    def ece(self, T):
+        return self._properties(T)['ECE']
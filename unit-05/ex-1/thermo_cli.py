@@ -0,0 +1,199 @@
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Расчет свойств веществ и реакций из командной строки с выводом CSV/JSON в stdout.
+# Модули с расчетом (numpy, species, reaction, debye) импортируются внутри команд,
+# matplotlib (через rendering) - только при --plot, pandas и scipy не нужны совсем.
+#   python unit-05/ex-1/thermo_cli.py species Water Hydrogen -T 300 500 1000
+#   python unit-05/ex-1/thermo_cli.py reaction "2H2 + O2 = 2H2O" --range 300 1000 8 --format json
+#   python unit-05/ex-1/thermo_cli.py debye --theta 428 --range 2 500 20 --plot debye.png
+#   python unit-05/ex-1/thermo_cli.py startup
+
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+UNIT_04 = os.path.join(FOLDER, '..', '..', 'unit-04')
+
+# Бюджет времени запуска команды (процесс целиком, медиана нескольких запусков), с
+STARTUP_BUDGET = 0.4
+STARTUP_COMMAND = ('species', 'Water', '-T', '298.15', '1000')
+
+
+def _temperatures(args) -> list[float]:
+    if args.range:
+        start, stop, count = args.range
+        count = int(count)
+        return [start + (stop - start) * i / max(count - 1, 1) for i in range(count)]
+    return args.T
+
+
+# Вне диапазона коэффициентов расчет прерывается ошибкой, с --extrapolate - ведется с предупреждением
+def _on_range(args) -> str:
+    return 'warn' if args.extrapolate else 'raise'
+
+
+# Свойства веществ: Cp в Дж/(моль K), H и G в кДж/моль, S в Дж/(моль K)
+def species_rows(args) -> list[dict]:
+    sys.path.append(os.path.join(UNIT_04, 'ex-3'))
+    import numpy as np
+    from thermodynamic import heat_capacity, piecewise_properties, piecewise_tables
+
+    kwargs = {'filepath': args.data} if args.data else {}
+    tables = piecewise_tables(args.names, **kwargs)
+    T = np.array(_temperatures(args), dtype=float)
+    H, S, G = piecewise_properties(tables, T, _on_range(args))
+    rows = []
+    for i, table in enumerate(tables):
+        Cp = heat_capacity(*table.coefficients_at(T), T)
+        for j, T_j in enumerate(T.tolist()):
+            rows.append({
+                'species': table.Name,
+                'T': T_j,
+                'Cp': float(Cp[j]) * 1e3,
+                'H': float(H[i, j]),
+                'S': float(S[i, j]) * 1e3,
+                'G': float(G[i, j]),
+                'in_range': bool(table.T_min <= T_j <= table.T_max),
+            })
+    return rows
+
+
+# Свойства реакций: dH, dG в кДж/моль, dS в Дж/(моль K), Kp, идеальный КПД в %
+def reaction_rows(args) -> list[dict]:
+    sys.path.append(FOLDER)
+    from reaction import screen_reactions
+
+    kwargs = {'filepath': args.data} if args.data else {}
+    T = _temperatures(args)
+    result = screen_reactions(args.equations, T, on_range=_on_range(args), **kwargs)
+    rows = []
+    for i, equation in enumerate(args.equations):
+        for j, T_j in enumerate(T):
+            rows.append({
+                'reaction': equation,
+                'T': T_j,
+                'Delta_H': float(result['Delta_H'][i, j]),
+                'Delta_S': float(result['Delta_S'][i, j]) * 1e3,
+                'Delta_G': float(result['Delta_G'][i, j]),
+                'Kp': float(result['Kp'][i, j]),
+                'ECE': float(result['ECE'][i, j]),
+            })
+    return rows
+
+
+# Модель Дебая: C_V, S в Дж/(моль K), U, F в Дж/моль
+def debye_rows(args) -> list[dict]:
+    sys.path.append(os.path.join(UNIT_04, 'ex-2'))
+    from debye import entropy, free_energy, heat_capacity, internal_energy
+
+    T = _temperatures(args)
+    columns = {
+        'C_V': heat_capacity(T, args.theta),
+        'U': internal_energy(T, args.theta),
+        'S': entropy(T, args.theta),
+        'F': free_energy(T, args.theta),
+    }
+    return [
+        {'theta_D': args.theta, 'T': T_j, **{name: float(values[j]) for name, values in columns.items()}}
+        for j, T_j in enumerate(T)
+    ]
+
+
+def write_rows(rows: list[dict], format: str, file=sys.stdout):
+    if format == 'json':
+        json.dump(rows, file, ensure_ascii=False, indent=1)
+        file.write('\n')
+        return
+    if rows:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]), lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# График всех числовых колонок от T (по серии на вещество/реакцию). matplotlib импортируется только здесь
+def plot_rows(rows: list[dict], path: str, key: str):
+    sys.path.append(os.path.join(UNIT_04, 'ex-3'))
+    from rendering import FigureSpec, Panel, render
+
+    columns = [name for name, value in rows[0].items() if name not in (key, 'T') and isinstance(value, float)]
+    series = {}
+    for row in rows:
+        series.setdefault(row[key], []).append(row)
+    labels = [str(label) for label in series]
+    T = [[row['T'] for row in part] for part in series.values()]
+    render(FigureSpec([Panel(T, [[row[column] for row in part] for part in series.values()], labels, title=column)
+                       for column in columns], path, size=(5 * len(columns), 4)))
+
+
+# Замер времени запуска: команда STARTUP_COMMAND в отдельном процессе, медиана из repeat запусков
+def measure_startup(repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.abspath(__file__), *STARTUP_COMMAND],
+                       check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Термодинамические свойства веществ и реакций')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_common(command, key):
+        temperatures = command.add_mutually_exclusive_group(required=True)
+        temperatures.add_argument('-T', type=float, nargs='+', help='температуры, K')
+        temperatures.add_argument('--range', type=float, nargs=3, metavar=('START', 'STOP', 'COUNT'),
+                                  help='равномерная сетка температур')
+        command.add_argument('--format', choices=('csv', 'json'), default='csv')
+        command.add_argument('--plot', metavar='PATH', help='сохранить график в файл')
+        command.set_defaults(key=key)
+
+    species = commands.add_parser('species', help='Cp, H, S, G веществ')
+    species.add_argument('names', nargs='+', help='названия или формулы веществ')
+    species.add_argument('--data', help='таблица коэффициентов (csv или база unit-03)')
+    species.add_argument('--extrapolate', action='store_true', help='считать и вне диапазона коэффициентов (с предупреждением)')
+    add_common(species, 'species')
+    species.set_defaults(rows=species_rows)
+
+    reaction = commands.add_parser('reaction', help='dH, dS, dG, Kp и КПД реакций')
+    reaction.add_argument('equations', nargs='+', help="уравнения реакций, например '2H2 + O2 = 2H2O'")
+    reaction.add_argument('--data', help='таблица коэффициентов (csv или база unit-03)')
+    reaction.add_argument('--extrapolate', action='store_true', help='считать и вне диапазона коэффициентов (с предупреждением)')
+    add_common(reaction, 'reaction')
+    reaction.set_defaults(rows=reaction_rows)
+
+    debye = commands.add_parser('debye', help='C_V, U, S, F по модели Дебая')
+    debye.add_argument('--theta', type=float, required=True, help='температура Дебая, K')
+    add_common(debye, 'theta_D')
+    debye.set_defaults(rows=debye_rows)
+
+    startup = commands.add_parser('startup', help='замер времени запуска и сравнение с бюджетом')
+    startup.add_argument('--repeat', type=int, default=5)
+    startup.add_argument('--budget', type=float, default=STARTUP_BUDGET, help='бюджет, с')
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'startup':
+        elapsed = measure_startup(args.repeat)
+        print(f"Время запуска: {elapsed:.3f} s, бюджет: {args.budget:.3f} s")
+        return 0 if elapsed <= args.budget else 1
+
+    try:
+        rows = args.rows(args)
+    except (KeyError, ValueError) as error:
+        parser.error(error.args[0] if error.args else str(error))
+    write_rows(rows, args.format)
+    if args.plot and rows:
+        plot_rows(rows, args.plot, args.key)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import numpy as np
+import time
+
+from equilibrium import SweepResult, equilibrium_sweep, gibbs_objective, reduced_gibbs_energies
+from composition import element_matrix
+
+# Минимальное количество вещества (защита логарифма от нуля)
+N_FLOOR = 1e-250
+
+
+# Равновесный состав методом элементных потенциалов (RAND, Gordon-McBride).
+# Условие минимума: G°j/RT + ln P + ln xj = sum_k a_kj pi_k, поэтому на каждой итерации Ньютона
+# решается система размера (число элементов + 1), а вклад веществ собирается суммированием.
+# g - приведенные энергии Гиббса (species) или (species x M) для M точек с общим составом элементов,
+# P - давление (число или массив длины M). Возвращает составы (M x species), число итераций и число вычислений
+# для каждой точки: на итерации считаются потенциалы mu (градиент G) и матрица системы Ньютона
+def solve_element_potentials(g: np.ndarray,
+                             Aeq: np.ndarray,
+                             beq: np.ndarray,
+                             P=1.0,
+                             tol: float = 1e-10,
+                             max_iter: int = 200) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    g = np.asarray(g, dtype=float)
+    g = g[:, np.newaxis] if g.ndim == 1 else g
+    Aeq = np.asarray(Aeq, dtype=float)
+    beq = np.asarray(beq, dtype=float)
+    n_species, n_points = g.shape
+    lnP = np.broadcast_to(np.log(np.asarray(P, dtype=float)), (n_points,))
+
+    # Элементы, которых нет в исходной смеси, и вещества с ними исключаются из расчета
+    present = beq > 0
+    active = ~np.any(Aeq[~present] > 0, axis=0)
+    A = Aeq[present][:, active]
+    b = beq[present]
+    g_active = g[active].T
+    n_elements, n_active = A.shape
+
+    n = np.full((n_points, n_active), 0.1 / n_active)
+    N = np.full(n_points, 0.1)
+    iterations = np.zeros(n_points, dtype=int)
+    evaluations = np.zeros(n_points, dtype=int)
+    todo = np.ones(n_points, dtype=bool)
+
+    for _ in range(max_iter):
+        if not todo.any():
+            break
+        nt, Nt = n[todo], N[todo]
+        # Приведенные химические потенциалы
+        mu = g_active[todo] + lnP[todo, np.newaxis] + np.log(nt / Nt[:, np.newaxis])
+        evaluations[todo] += 1
+        An = nt @ A.T
+        n_mu = nt * mu
+
+        matrix = np.empty((len(nt), n_elements + 1, n_elements + 1))
+        matrix[:, :n_elements, :n_elements] = np.einsum('kj,ij,mj->mki', A, A, nt)
+        matrix[:, :n_elements, n_elements] = An
+        matrix[:, n_elements, :n_elements] = An
+        matrix[:, n_elements, n_elements] = nt.sum(axis=1) - Nt
+        evaluations[todo] += 1
+        rhs = np.empty((len(nt), n_elements + 1))
+        rhs[:, :n_elements] = b - An + n_mu @ A.T
+        rhs[:, n_elements] = Nt - nt.sum(axis=1) + n_mu.sum(axis=1)
+
+        solution = np.linalg.solve(matrix, rhs[..., np.newaxis])[..., 0]
+        pi, dlnN = solution[:, :n_elements], solution[:, n_elements]
+        dln_n = -mu + pi @ A + dlnN[:, np.newaxis]
+
+        # Ограничение шага, как в CEA: изменение ln n не больше 2 за итерацию
+        largest = np.maximum(5 * np.abs(dlnN), np.max(np.abs(dln_n), axis=1))
+        lam = np.minimum(1.0, 2.0 / np.maximum(largest, 1e-300))
+        n[todo] = np.maximum(nt * np.exp(lam[:, np.newaxis] * dln_n), N_FLOOR)
+        N[todo] = Nt * np.exp(lam * dlnN)
+        iterations[todo] += 1
+
+        error = np.max(nt * np.abs(dln_n), axis=1) / nt.sum(axis=1)
+        converged = (error < tol) & (np.abs(dlnN) < tol)
+        todo[np.flatnonzero(todo)[converged]] = False
+
+    result = np.zeros((n_points, n_species))
+    result[:, active] = n
+    return result, iterations, evaluations
+
+
+# Расчет равновесия на сетке температур методом элементных потенциалов
+def element_potential_sweep(species: list[str],
+                            Aeq: np.ndarray,
+                            feed: np.ndarray,
+                            T: np.ndarray,
+                            P: float = 1.0,
+                            tol: float = 1e-10,
+                            max_iter: int = 200,
+                            on_range: str = 'raise') -> SweepResult:
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    g = reduced_gibbs_energies(species, T, on_range=on_range)
+    n, iterations, evaluations = solve_element_potentials(g, Aeq, Aeq @ feed, P, tol, max_iter)
+    return SweepResult(T, n, iterations, evaluations, iterations < max_iter)
+
+
+if __name__ == '__main__':
+    species = ['Methane', 'Water', 'Carbon Monoxide', 'Hydrogen']
+    # Баланс C, H, O строится по формулам веществ
+    _, Aeq = element_matrix(species)
+    feed = np.array([1.0, 3.0, 0.0, 0.0])
+    # Общий диапазон коэффициентов веществ: до 800 K (CO)
+    T = np.linspace(600, 800, 121)
+    slsqp = equilibrium_sweep(species, Aeq, feed, T)
+    rand = element_potential_sweep(species, Aeq, feed, T)
+    print(f'Steam reforming: max difference with SLSQP = {np.max(np.abs(slsqp.n - rand.n)):.2e}')
+
+    # Газовая смесь C/H/O/N из газов таблицы (без пропана: его коэффициенты заданы только до 298.15 K)
+    species = ['Hydrogen', 'Oxygen', 'Water', 'Carbon Monoxide', 'Carbon Dioxide', 'Methane', 'Methanol',
+               'Ethane', 'Ethylene', 'Acethylene', 'Buthane', 'Nitrogen', 'Ammonia']
+    _, Aeq = element_matrix(species)
+    feed = np.zeros(len(species))
+    feed[[2, 5, 11]] = [2.0, 1.0, 0.5]  # H2O, CH4, N2
+    # Общий диапазон коэффициентов: от 350 K (N2) до 600 K (C2H4)
+    T = np.linspace(350, 600, 1000)
+    start = time.perf_counter()
+    rand = element_potential_sweep(species, Aeq, feed, T)
+    elapsed = time.perf_counter() - start
+    print(f'{len(species)} species: {elapsed / len(T) * 1e6:.1f} us per point, '
+          f'iterations {rand.iterations.min()}-{rand.iterations.max()}, all converged: {rand.success.all()}')
+    # SLSQP может остановиться раньше, поэтому сравниваются и составы, и значения целевой функции
+    T = T[::100]
+    slsqp = equilibrium_sweep(species, Aeq, feed, T)
+    rand = element_potential_sweep(species, Aeq, feed, T)
+    g = reduced_gibbs_energies(species, T)
+    gap = [gibbs_objective(slsqp.n[i], g[:, i], 0) - gibbs_objective(np.maximum(rand.n[i], N_FLOOR), g[:, i], 0)
+           for i in range(len(T))]
+    print(f'{len(species)} species: max difference with SLSQP = {np.max(np.abs(slsqp.n - rand.n)):.2e}, '
+          f'G(SLSQP) - G(RAND) = {min(gap):.2e}..{max(gap):.2e}')
+    print('Готово!')
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from scipy import constants, optimize
+import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'unit-04', 'ex-3'))
+from composition import element_matrix
+from gibbs_cache import get_gibbs_cache
+from species import DEFAULT_FILEPATH
+
+# Нижняя граница количества вещества, чтобы логарифм оставался определен
+N_MIN = 1e-12
+
+
+# Приведенные стандартные энергии Гиббса G°/RT веществ, (species x T).
+# G° берутся из общего кэша: при повторных расчетах на тех же температурах не пересчитываются.
+# Температуры вне диапазона коэффициентов (CH4 до 1000 K, CO до 800 K, C3H8 только 298 K) по умолчанию
+# дают TemperatureRangeError; экстраполяцию с предупреждением нужно запросить явно: on_range='warn'
+def reduced_gibbs_energies(species: list[str], T, filepath: str = DEFAULT_FILEPATH, on_range: str = 'raise') -> np.ndarray:
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    G = get_gibbs_cache(filepath).species(species, T, on_range)
+    # G в кДж/моль, R в Дж/(моль K)
+    return G * 1e3 / (constants.R * T)
+
+
+# Целевая функция: sum(nj * (G°j/RT + ln P + ln xj))
+def gibbs_objective(nj: np.ndarray, g: np.ndarray, lnP: float) -> float:
+    Enj = np.sum(nj)
+    return np.sum(nj * (g + lnP + np.log(nj / Enj)))
+
+
+# Точный градиент целевой функции: G°j/RT + ln P + ln xj
+def gibbs_gradient(nj: np.ndarray, g: np.ndarray, lnP: float) -> np.ndarray:
+    return g + lnP + np.log(nj / np.sum(nj))
+
+
+# Минимизация энергии Гиббса при одной температуре, g - приведенные энергии Гиббса G°/RT.
+# Решателю передаются точный градиент целевой функции и якобиан ограничений
+def solve_equilibrium(g: np.ndarray,
+                      Aeq: np.ndarray,
+                      beq: np.ndarray,
+                      n0: np.ndarray,
+                      P: float = 1.0) -> optimize.OptimizeResult:
+    lnP = np.log(P)
+    n0 = np.maximum(np.asarray(n0, dtype=float), N_MIN)
+    constraints = {'type': 'eq', 'fun': lambda n: Aeq @ n - beq, 'jac': lambda n: Aeq}
+    return optimize.minimize(gibbs_objective, n0, args=(g, lnP), jac=gibbs_gradient, method='SLSQP',
+                             bounds=optimize.Bounds(N_MIN, np.inf), constraints=constraints,
+                             options={'maxiter': 100, 'ftol': 1e-10})
+
+
+def get_equilibrium_concentrations(species: list[str],
+                                   Aeq: np.ndarray,
+                                   feed: np.ndarray,
+                                   Temp: float,
+                                   n0: np.ndarray,
+                                   P: float = 1.0,
+                                   on_range: str = 'raise') -> np.ndarray:
+    g = reduced_gibbs_energies(species, Temp, on_range=on_range)[:, 0]
+    beq = Aeq @ feed
+    return solve_equilibrium(g, Aeq, beq, n0, P).x
+
+
+# Результат расчета равновесия на сетке температур. evaluations - вычисления функций решателем в каждой точке:
+# для SLSQP целевая функция и градиент (nfev + njev), для метода элементных потенциалов - потенциалы и матрица Ньютона
+@dataclass
+class SweepResult:
+    T: np.ndarray
+    n: np.ndarray
+    iterations: np.ndarray
+    evaluations: np.ndarray
+    success: np.ndarray
+
+
+# Расчет равновесия на сетке температур с продолжением по температуре:
+# решение в предыдущей точке служит начальным приближением для следующей
+def equilibrium_sweep(species: list[str],
+                      Aeq: np.ndarray,
+                      feed: np.ndarray,
+                      T: np.ndarray,
+                      n0: np.ndarray | None = None,
+                      P: float = 1.0,
+                      warm_start: bool = True,
+                      on_range: str = 'raise') -> SweepResult:
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    n0 = np.ones(len(species)) if n0 is None else np.asarray(n0, dtype=float)
+    g = reduced_gibbs_energies(species, T, on_range=on_range)
+    beq = Aeq @ feed
+
+    n = np.empty((len(T), len(species)))
+    iterations = np.empty(len(T), dtype=int)
+    evaluations = np.empty(len(T), dtype=int)
+    success = np.empty(len(T), dtype=bool)
+    guess = n0
+    for i in range(len(T)):
+        result = solve_equilibrium(g[:, i], Aeq, beq, guess, P)
+        n[i] = result.x
+        iterations[i] = result.nit
+        evaluations[i] = result.nfev + result.njev
+        success[i] = result.success
+        if warm_start and result.success:
+            guess = result.x
+    return SweepResult(T, n, iterations, evaluations, success)
+
+
+if __name__ == '__main__':
+    species = ['Methane', 'Water', 'Carbon Monoxide', 'Hydrogen']
+    # Баланс C, H, O строится по формулам веществ
+    _, Aeq = element_matrix(species)
+    feed = np.array([1.0, 3.0, 0.0, 0.0])
+    # Общий диапазон коэффициентов веществ: до 800 K (CO)
+    T = np.linspace(600, 800, 121)
+    cold = equilibrium_sweep(species, Aeq, feed, T, warm_start=False)
+    warm = equilibrium_sweep(species, Aeq, feed, T)
+    print(f'Cold start: iterations = {cold.iterations.sum()}, evaluations = {cold.evaluations.sum()}')
+    print(f'Warm start: iterations = {warm.iterations.sum()}, evaluations = {warm.evaluations.sum()}')
+    print(f'Max difference: {np.max(np.abs(cold.n - warm.n)):.2e}')
@@ -0,0 +1,112 @@
+from multiprocessing import Pool, sharedctypes
+import numpy as np
+import os
+import time
+
+from equilibrium import reduced_gibbs_energies, solve_equilibrium
+from composition import element_matrix
+
+# Общие для процесса-исполнителя данные (задаются один раз при запуске процесса)
+_worker = {}
+
+
+# Массив в разделяемой памяти: передается процессам при запуске, а не с каждой задачей
+def _shared_array(shape: tuple[int, ...], values: np.ndarray | None = None) -> sharedctypes.RawArray:
+    raw = sharedctypes.RawArray('d', int(np.prod(shape)))
+    if values is not None:
+        _as_array(raw, shape)[...] = values
+    return raw
+
+
+def _as_array(raw: sharedctypes.RawArray, shape: tuple[int, ...]) -> np.ndarray:
+    return np.frombuffer(raw, dtype=float).reshape(shape)
+
+
+def _init_worker(Aeq: np.ndarray, P: np.ndarray, g_raw, g_shape, feeds_raw, feeds_shape, out_raw, out_shape):
+    _worker['Aeq'] = Aeq
+    _worker['P'] = P
+    _worker['g'] = _as_array(g_raw, g_shape)
+    _worker['feeds'] = _as_array(feeds_raw, feeds_shape)
+    _worker['out'] = _as_array(out_raw, out_shape)
+
+
+# Решение для набора линий сетки. Линия - пара (состав сырья, давление),
+# вдоль нее температура меняется, и решение в предыдущей точке служит начальным приближением.
+# Результат пишется прямо в общий массив, возвращается число неудачных решений
+def _solve_lines(lines: range) -> int:
+    Aeq, P, g, feeds, out = (_worker[key] for key in ('Aeq', 'P', 'g', 'feeds', 'out'))
+    failures = 0
+    for line in lines:
+        f, p = divmod(line, len(P))
+        beq = Aeq @ feeds[f]
+        guess = np.ones(Aeq.shape[1])
+        for t in range(g.shape[1]):
+            result = solve_equilibrium(g[:, t], Aeq, beq, guess, P[p])
+            if result.success:
+                out[f, t, p] = result.x
+                guess = result.x
+            else:
+                out[f, t, p] = np.nan
+                failures += 1
+    return failures
+
+
+# Расчет равновесия на сетке (состав сырья x температура x давление).
+# feeds - массив (F x species), результат - массив (F x T x P x species),
+# точки, в которых решатель не сошелся, заполняются NaN
+def equilibrium_grid(species: list[str],
+                     Aeq: np.ndarray,
+                     feeds: np.ndarray,
+                     T: np.ndarray,
+                     P=(1.0,),
+                     processes: int | None = None,
+                     chunksize: int | None = None,
+                     on_range: str = 'raise') -> np.ndarray:
+    Aeq = np.asarray(Aeq, dtype=float)
+    feeds = np.atleast_2d(np.asarray(feeds, dtype=float))
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    P = np.atleast_1d(np.asarray(P, dtype=float))
+    g = reduced_gibbs_energies(species, T, on_range=on_range)
+
+    out_shape = (len(feeds), len(T), len(P), len(species))
+    g_raw = _shared_array(g.shape, g)
+    feeds_raw = _shared_array(feeds.shape, feeds)
+    out_raw = _shared_array(out_shape)
+    initargs = (Aeq, P, g_raw, g.shape, feeds_raw, feeds.shape, out_raw, out_shape)
+
+    n_lines = len(feeds) * len(P)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        _init_worker(*initargs)
+        _solve_lines(range(n_lines))
+    else:
+        chunksize = chunksize or max(1, -(-n_lines // (4 * processes)))
+        chunks = [range(start, min(start + chunksize, n_lines)) for start in range(0, n_lines, chunksize)]
+        with Pool(processes, initializer=_init_worker, initargs=initargs) as pool:
+            pool.map(_solve_lines, chunks)
+
+    return _as_array(out_raw, out_shape).copy()
+
+
+if __name__ == '__main__':
+    species = ['Methane', 'Water', 'Carbon Monoxide', 'Hydrogen']
+    # Баланс C, H, O строится по формулам веществ
+    _, Aeq = element_matrix(species)
+    # Отношение пар/углерод от 1 до 5
+    feeds = np.array([[1.0, s, 0.0, 0.0] for s in np.linspace(1, 5, 16)])
+    # Общий диапазон коэффициентов веществ: до 800 K (CO)
+    T = np.linspace(600, 800, 25)
+    P = np.array([1.0, 5.0, 10.0, 20.0])
+
+    start = time.perf_counter()
+    serial = equilibrium_grid(species, Aeq, feeds, T, P, processes=1)
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = equilibrium_grid(species, Aeq, feeds, T, P)
+    parallel_time = time.perf_counter() - start
+
+    print(f'Points: {serial.shape[0] * serial.shape[1] * serial.shape[2]}, processes: {os.cpu_count()}')
+    print(f'Serial: {serial_time:.2f} s, parallel: {parallel_time:.2f} s')
+    print(f'Max difference: {np.nanmax(np.abs(serial - parallel)):.2e}')
+    print('Готово!')